@@ -0,0 +1,63 @@
+# Sequential add_case writes/sec: the old five-statement write path (two
+# existence SELECTs, INSERT, COMMIT, refresh SELECT) against the current
+# mcp_server.add_case, on a scratch database.
+#
+#   python benchmarks/bench_add_case.py --writes 2000
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import time
+
+tmp = tempfile.TemporaryDirectory()
+os.environ["LEGAL_DB_URL"] = f"sqlite:///{tmp.name}/bench.db"
+os.environ["LEGAL_SLOW_QUERY_MS"] = "-1"
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy.ext.asyncio import async_sessionmaker
+from database import create_async_db_engine
+from cache import entity_cache
+import mcp_server
+import models
+
+# The tools read through a read-only pool, so the old path gets its own
+legacy_sessions = async_sessionmaker(bind=create_async_db_engine(), expire_on_commit=False)
+
+async def legacy_add_case(title, description, client_id, lawyer_id):
+    async with legacy_sessions() as db:
+        client = await db.get(models.Client, client_id)
+        if not client:
+            raise ValueError(f"Client with ID {client_id} not found")
+        lawyer = await db.get(models.Lawyer, lawyer_id)
+        if not lawyer:
+            raise ValueError(f"Lawyer with ID {lawyer_id} not found")
+        case = models.Case(title=title, description=description,
+                           client_id=client_id, lawyer_id=lawyer_id)
+        db.add(case)
+        await db.commit()
+        await db.refresh(case)
+        return {"id": case.id, "client_name": client.name, "lawyer_name": lawyer.name}
+
+async def measure(name, add_case, writes):
+    start = time.perf_counter()
+    for i in range(writes):
+        await add_case(f"Case {i}", "Benchmark case", i % 50 + 1, i % 10 + 1)
+    elapsed = time.perf_counter() - start
+    print(f"{name:>22}: {writes / elapsed:8.0f} writes/s")
+
+async def main(writes):
+    await mcp_server.add_clients_bulk([{"name": f"Client {i}", "contact": "c"} for i in range(50)])
+    await mcp_server.add_lawyers_bulk([{"name": f"Lawyer {i}", "specialization": "Tax"} for i in range(10)])
+
+    await measure("before (5 statements)", legacy_add_case, writes)
+    entity_cache.enabled = False
+    await measure("after (uncached)", mcp_server.add_case, writes)
+    entity_cache.enabled = True
+    await measure("after (cached FKs)", mcp_server.add_case, writes)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--writes", type=int, default=2000)
+    args = parser.parse_args()
+    asyncio.run(main(args.writes))
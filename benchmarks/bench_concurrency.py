@@ -0,0 +1,106 @@
+# Concurrent readers and writers against a scratch SQLite database, once with
+# SQLite's defaults (rollback journal, synchronous=FULL) and once with the
+# tuned profile from database.py.
+#
+#   python benchmarks/bench_concurrency.py --readers 8 --writers 4 --seconds 5
+import argparse
+import os
+import sys
+import tempfile
+import threading
+import time
+
+os.environ["LEGAL_SLOW_QUERY_MS"] = "-1"
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import sessionmaker
+from database import DEFAULT_PRAGMAS, create_db_engine
+from migrations import migrate
+import models
+
+PROFILES = {
+    "default": {},
+    "tuned": DEFAULT_PRAGMAS,
+}
+
+def seed(Session, clients=100, lawyers=20, cases=5000):
+    db = Session()
+    db.add_all(models.Client(name=f"Client {i}", contact=f"c{i}@example.com") for i in range(clients))
+    db.add_all(models.Lawyer(name=f"Lawyer {i}", specialization="Civil Law") for i in range(lawyers))
+    db.flush()
+    db.add_all(
+        models.Case(
+            title=f"Case {i}",
+            description="Seeded case",
+            client_id=i % clients + 1,
+            lawyer_id=i % lawyers + 1,
+        )
+        for i in range(cases)
+    )
+    db.commit()
+    db.close()
+
+def run_profile(name, pragmas, readers, writers, seconds):
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_db_engine(f"sqlite:///{tmp}/bench.db", pragmas=pragmas,
+                                  pool_size=readers + writers)
+        migrate(engine)
+        Session = sessionmaker(bind=engine)
+        seed(Session)
+
+        counts = {"reads": 0, "writes": 0, "locked": 0}
+        lock = threading.Lock()
+        stop = threading.Event()
+
+        def bump(key):
+            with lock:
+                counts[key] += 1
+
+        def reader(n):
+            while not stop.is_set():
+                db = Session()
+                try:
+                    db.query(models.Case).filter(models.Case.client_id == n % 100 + 1).all()
+                    bump("reads")
+                except OperationalError:
+                    bump("locked")
+                finally:
+                    db.close()
+
+        def writer(n):
+            while not stop.is_set():
+                db = Session()
+                try:
+                    db.add(models.Case(title=f"Bench {n}", description="x", client_id=1, lawyer_id=1))
+                    db.commit()
+                    bump("writes")
+                except OperationalError:
+                    db.rollback()
+                    bump("locked")
+                finally:
+                    db.close()
+
+        threads = [threading.Thread(target=reader, args=(i,)) for i in range(readers)]
+        threads += [threading.Thread(target=writer, args=(i,)) for i in range(writers)]
+        for thread in threads:
+            thread.start()
+        time.sleep(seconds)
+        stop.set()
+        for thread in threads:
+            thread.join()
+        engine.dispose()
+
+    print(f"{name:>8}: {counts['reads'] / seconds:9.0f} reads/s "
+          f"{counts['writes'] / seconds:9.0f} writes/s "
+          f"{counts['locked']:6d} locked errors")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--readers", type=int, default=8)
+    parser.add_argument("--writers", type=int, default=4)
+    parser.add_argument("--seconds", type=float, default=5)
+    args = parser.parse_args()
+
+    for name, pragmas in PROFILES.items():
+        run_profile(name, pragmas, args.readers, args.writers, args.seconds)
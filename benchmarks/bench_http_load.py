@@ -0,0 +1,135 @@
+# Throughput of the stateless streamable-HTTP transport as worker processes
+# are added. For each worker count the server is started on a scratch copy
+# of the database and hammered with tools/call requests from several load
+# generator processes, then requests/sec and latency are reported.
+#
+#   python benchmarks/bench_http_load.py --db bench_100k.db --workers 1,2,4,8
+import argparse
+import asyncio
+import json
+import multiprocessing
+import os
+import random
+import shutil
+import signal
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import time
+
+import httpx
+
+REPO = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+HEADERS = {"Accept": "application/json, text/event-stream", "Content-Type": "application/json"}
+
+def percentile(samples, q):
+    ordered = sorted(samples)
+    return ordered[max(0, min(len(ordered) - 1, round(q / 100 * len(ordered)) - 1))] if ordered else 0.0
+
+def start_server(db_path, port, workers):
+    env = dict(os.environ, LEGAL_DB_URL=f"sqlite:///{db_path}", LEGAL_SLOW_QUERY_MS="-1")
+    server = subprocess.Popen(
+        [sys.executable, "mcp_server.py", "--server_type", "streamable-http",
+         "--port", str(port), "--workers", str(workers)],
+        cwd=REPO, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, start_new_session=True,
+    )
+    deadline = time.time() + 30
+    while time.time() < deadline:
+        try:
+            if httpx.get(f"http://127.0.0.1:{port}/metrics", timeout=1).status_code == 200:
+                # Give the remaining workers a moment to finish importing
+                time.sleep(1 + workers * 0.5)
+                return server
+        except httpx.HTTPError:
+            time.sleep(0.2)
+    stop_server(server)
+    raise RuntimeError("server did not start")
+
+def stop_server(server):
+    os.killpg(server.pid, signal.SIGTERM)
+    server.wait(timeout=30)
+
+async def generate_load(url, concurrency, duration, max_case_id, seed):
+    """Send tools/call requests from `concurrency` tasks until time is up."""
+    rng = random.Random(seed)
+    latencies, errors = [], 0
+    deadline = time.perf_counter() + duration
+
+    async def worker(client):
+        nonlocal errors
+        while time.perf_counter() < deadline:
+            body = {"jsonrpc": "2.0", "id": 1, "method": "tools/call",
+                    "params": {"name": "get_case_by_id", "arguments": {"case_id": rng.randint(1, max_case_id)}}}
+            start = time.perf_counter()
+            try:
+                response = await client.post(url, json=body, headers=HEADERS)
+                payload = response.json() if response.status_code == 200 else {}
+                ok = "result" in payload and not payload["result"].get("isError")
+            except httpx.HTTPError:
+                ok = False
+            if ok:
+                latencies.append(time.perf_counter() - start)
+            else:
+                errors += 1
+
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(limits=limits, timeout=30) as client:
+        await asyncio.gather(*(worker(client) for _ in range(concurrency)))
+    return latencies, errors
+
+def load_process(args):
+    return asyncio.run(generate_load(*args))
+
+def run_level(db_path, port, workers, clients, concurrency, duration, max_case_id):
+    server = start_server(db_path, port, workers)
+    try:
+        url = f"http://127.0.0.1:{port}/mcp"
+        jobs = [(url, max(1, concurrency // clients), duration, max_case_id, seed) for seed in range(clients)]
+        with multiprocessing.Pool(clients) as pool:
+            results = pool.map(load_process, jobs)
+    finally:
+        stop_server(server)
+    latencies = [latency for result in results for latency in result[0]]
+    return {
+        "workers": workers,
+        "requests_per_sec": round(len(latencies) / duration, 1),
+        "p50_ms": round(percentile(latencies, 50) * 1000, 2),
+        "p99_ms": round(percentile(latencies, 99) * 1000, 2),
+        "errors": sum(result[1] for result in results),
+    }
+
+if __name__ == "__main__":
+    cores = os.cpu_count() or 1
+    default_workers = sorted({1, 2, 4, cores} & set(range(1, cores + 1))) or [1]
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--db", default=os.path.join(REPO, "legal.db"))
+    parser.add_argument("--workers", default=",".join(map(str, default_workers)),
+                        help="Comma-separated worker counts to try")
+    parser.add_argument("--clients", type=int, default=max(1, cores // 2), help="Load generator processes")
+    parser.add_argument("--concurrency", type=int, default=64, help="Requests in flight in total")
+    parser.add_argument("--duration", type=float, default=10.0, help="Seconds per worker count")
+    parser.add_argument("--port", type=int, default=3100)
+    parser.add_argument("--out", help="Save the results as JSON")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, "load.db")
+        shutil.copyfile(args.db, db_path)
+        with sqlite3.connect(db_path) as conn:
+            max_case_id = conn.execute("SELECT MAX(id) FROM cases").fetchone()[0]
+
+        print(f"{cores} cores, {args.clients} load processes, {args.concurrency} requests in flight")
+        print(f"{'workers':>8} {'req/s':>10} {'scaling':>8} {'p50 ms':>9} {'p99 ms':>9} {'errors':>7}")
+        levels = []
+        for workers in map(int, args.workers.split(",")):
+            level = run_level(db_path, args.port, workers, args.clients,
+                              args.concurrency, args.duration, max_case_id)
+            level["scaling"] = round(level["requests_per_sec"] / levels[0]["requests_per_sec"], 2) if levels else 1.0
+            levels.append(level)
+            print(f"{workers:>8} {level['requests_per_sec']:>10.1f} {level['scaling']:>7.2f}x "
+                  f"{level['p50_ms']:>9.2f} {level['p99_ms']:>9.2f} {level['errors']:>7}")
+
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump({"cores": cores, "concurrency": args.concurrency, "levels": levels}, f, indent=2)
@@ -0,0 +1,82 @@
+# Per-row cost of turning case rows into tool payload dicts: ORM instances
+# with joined client/lawyer and a hand-built dict (the old tool code path)
+# against the Core SELECT + rows_to_dicts() path in serializers.py.
+#
+#   python benchmarks/bench_serialization.py --rows 100000
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+tmp = tempfile.TemporaryDirectory()
+os.environ["LEGAL_DB_URL"] = f"sqlite:///{tmp.name}/bench.db"
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import insert, select
+from sqlalchemy.orm import joinedload
+from database import SessionLocal, engine
+from migrations import migrate
+from serializers import case_select, rows_to_dicts
+import models
+
+def seed(rows):
+    with engine.begin() as conn:
+        conn.execute(insert(models.Client), [{"name": f"Client {i}", "contact": f"c{i}@example.com"} for i in range(1000)])
+        conn.execute(insert(models.Lawyer), [{"name": f"Lawyer {i}", "specialization": "Civil Law"} for i in range(100)])
+        conn.execute(insert(models.Case), [
+            {"title": f"Case {i}", "description": "Seeded case " * 10,
+             "client_id": i % 1000 + 1, "lawyer_id": i % 100 + 1}
+            for i in range(rows)
+        ])
+
+def orm_dicts():
+    db = SessionLocal()
+    try:
+        cases = db.execute(
+            select(models.Case).options(joinedload(models.Case.client), joinedload(models.Case.lawyer))
+        ).scalars().all()
+        result = []
+        for case in cases:
+            case_data = {
+                "id": case.id,
+                "title": case.title,
+                "description": case.description,
+                "client_id": case.client_id,
+                "lawyer_id": case.lawyer_id,
+                "created_at": None,
+            }
+            if case.client:
+                case_data["client_name"] = case.client.name
+                case_data["client_contact"] = case.client.contact
+            if case.lawyer:
+                case_data["lawyer_name"] = case.lawyer.name
+                case_data["lawyer_specialization"] = case.lawyer.specialization
+            result.append(case_data)
+        return result
+    finally:
+        db.close()
+
+def core_dicts():
+    with engine.connect() as conn:
+        return rows_to_dicts(conn.execute(case_select()))
+
+def measure(name, fetch, rows, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fetch()
+        best = min(best, time.perf_counter() - start)
+    assert len(result) == rows
+    print(f"{name:>14}: {best * 1000:8.0f} ms total {best / rows * 1e6:7.2f} µs/row")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=100000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    migrate()
+    seed(args.rows)
+    measure("ORM + dict", orm_dicts, args.rows, args.repeat)
+    measure("Core + dicts", core_dicts, args.rows, args.repeat)
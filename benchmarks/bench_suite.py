@@ -0,0 +1,275 @@
+# Run every MCP tool in mcp_server.py and every route in main.py against
+# generated databases (see generate_dataset.py) and report p50/p95/p99
+# latency, peak RSS and SQL statements per call. Each database is measured
+# in its own process, on a scratch copy unless --in-place is given, and the
+# results are saved as JSON that --compare can diff across runs.
+#
+#   python benchmarks/bench_suite.py bench_10k.db bench_100k.db --out results.json
+#   python benchmarks/bench_suite.py --compare before.json after.json
+import argparse
+import asyncio
+import json
+import os
+import random
+import resource
+import shutil
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+
+REPO = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def percentile(samples, q):
+    """Nearest-rank percentile of a list of numbers."""
+    ordered = sorted(samples)
+    return ordered[max(0, min(len(ordered) - 1, round(q / 100 * len(ordered)) - 1))]
+
+def peak_rss_mb():
+    """Peak RSS of this whole process so far."""
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+def proc_status_mb(field):
+    with open("/proc/self/status") as f:
+        for line in f:
+            if line.startswith(field + ":"):
+                return int(line.split()[1]) / 1024
+    raise OSError(f"{field} not in /proc/self/status")
+
+def start_rss_window():
+    """Reset the kernel's peak RSS (VmHWM) so it covers only what runs next.
+
+    Returns the RSS at the start in MB, or None where the peak can't be
+    reset (not Linux), in which case no per-benchmark peak is reported.
+    """
+    try:
+        with open("/proc/self/clear_refs", "w") as f:
+            f.write("5")
+        return proc_status_mb("VmRSS")
+    except OSError:
+        return None
+
+def rss_window(start):
+    """Peak RSS since start_rss_window(), and how far it rose above the start."""
+    if start is None:
+        return {"peak_rss_mb": None, "rss_growth_mb": None}
+    peak = proc_status_mb("VmHWM")
+    return {"peak_rss_mb": round(peak, 1), "rss_growth_mb": round(peak - start, 1)}
+
+def tool_specs(rng, n_clients, n_lawyers, n_cases):
+    """Argument factories for each MCP tool; heavy ones run fewer times."""
+    case_id = lambda: rng.randint(1, n_cases)
+    client_id = lambda: rng.randint(1, n_clients)
+    lawyer_id = lambda: rng.randint(1, n_lawyers)
+    new_case = lambda: {"title": "Benchmark case", "description": "Synthetic",
+                        "client_id": client_id(), "lawyer_id": lawyer_id()}
+    return {
+        "get_all_cases": (lambda: {}, True),
+        "get_cases_page": (lambda: {"limit": 50}, False),
+        "get_case_by_id": (lambda: {"case_id": case_id()}, False),
+        "get_cases_by_ids": (lambda: {"case_ids": [case_id() for _ in range(50)]}, False),
+        "add_case": (new_case, False),
+        "add_cases_bulk": (lambda: {"cases": [new_case() for _ in range(100)]}, False),
+        "get_all_clients": (lambda: {}, True),
+        "get_clients_page": (lambda: {"limit": 50}, False),
+        "get_client_by_id": (lambda: {"client_id": client_id()}, False),
+        "get_clients_by_ids": (lambda: {"client_ids": [client_id() for _ in range(50)]}, False),
+        "add_client": (lambda: {"name": "Bench Client", "contact": "bench@example.com"}, False),
+        "add_clients_bulk": (lambda: {"clients": [{"name": "Bench", "contact": "b"}] * 100}, False),
+        "get_all_lawyers": (lambda: {}, True),
+        "get_lawyers_page": (lambda: {"limit": 50}, False),
+        "get_lawyer_by_id": (lambda: {"lawyer_id": lawyer_id()}, False),
+        "get_lawyers_by_ids": (lambda: {"lawyer_ids": [lawyer_id() for _ in range(50)]}, False),
+        "find_clients_by_name": (lambda: {"name": rng.choice(["Priya Sharma", "Rohan Iyr", "kapoor", "Arjn Mehta"])}, False),
+        "find_lawyers_by_name": (lambda: {"name": rng.choice(["Adv. Meera Nair", "Vikram Sing", "das"])}, False),
+        "add_lawyer": (lambda: {"name": "Bench Lawyer", "specialization": "Tax Law"}, False),
+        "add_lawyers_bulk": (lambda: {"lawyers": [{"name": "Bench", "specialization": "Tax Law"}] * 100}, False),
+        "get_cases_by_client": (lambda: {"client_id": client_id()}, False),
+        "get_cases_by_lawyer": (lambda: {"lawyer_id": lawyer_id()}, False),
+        "search_cases": (lambda: {"query": rng.choice(["theft", "divorce", "tax", "merger pune", "visa"])}, False),
+        "count_cases": (lambda: {"group_by": rng.choice(["status", "lawyer", "specialization", "month"])}, False),
+        "get_cases_by_date": (lambda: {"created_after": f"{rng.randint(2019, 2024)}-{rng.randint(1, 12):02d}-01"}, False),
+        "case_histogram": (lambda: {"interval": rng.choice(["day", "week", "month"]),
+                                    "created_after": f"{rng.randint(2019, 2023)}-01-01",
+                                    "created_before": f"{rng.randint(2024, 2025)}-01-01"}, False),
+        "find_similar_cases": (lambda: rng.choice([{"case_id": case_id()}, {"text": "tax evasion appeal"}]), False),
+        "export_cases": (lambda: {"file_name": "bench.csv.gz", "format": "csv", "compression": "gzip"}, True),
+    }
+
+def route_specs(rng, n_clients, n_lawyers):
+    """(method, path, form factory, heavy) for each main.py route."""
+    return {
+        "GET /": ("get", "/", lambda: None, True),
+        "POST /add_case": ("post", "/add_case", lambda: {
+            "title": "Benchmark case", "description": "Synthetic",
+            "client_id": rng.randint(1, n_clients), "lawyer_id": rng.randint(1, n_lawyers)}, False),
+        "POST /add_client": ("post", "/add_client", lambda: {"name": "Bench", "contact": "b"}, False),
+        "POST /add_lawyer": ("post", "/add_lawyer", lambda: {"name": "Bench", "specialization": "Tax Law"}, False),
+    }
+
+def summarize(latencies, statements, rss_start):
+    return {
+        "calls": len(latencies),
+        "p50_ms": round(percentile(latencies, 50) * 1000, 3),
+        "p95_ms": round(percentile(latencies, 95) * 1000, 3),
+        "p99_ms": round(percentile(latencies, 99) * 1000, 3),
+        "mean_ms": round(sum(latencies) / len(latencies) * 1000, 3),
+        "statements_per_call": round(statements / len(latencies), 2),
+        **rss_window(rss_start),
+    }
+
+def run_single(db_path, iterations, heavy_iterations, skip, seed):
+    """Benchmark one database in this process and return its results."""
+    os.environ["LEGAL_DB_URL"] = f"sqlite:///{db_path}"
+    os.environ.setdefault("LEGAL_SLOW_QUERY_MS", "-1")
+    os.environ.setdefault("LEGAL_EXPORT_DIR", tempfile.mkdtemp())
+    os.environ.setdefault("LEGAL_SIMILARITY_INDEX", os.path.join(tempfile.mkdtemp(), "similarity"))
+    os.chdir(REPO)
+    sys.path.insert(0, REPO)
+
+    with sqlite3.connect(db_path) as conn:
+        n_cases, n_clients, n_lawyers = (
+            conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+            for table in ("cases", "clients", "lawyers")
+        )
+
+    from sqlalchemy import event
+    from fastapi.testclient import TestClient
+    import database
+    import mcp_server
+    import main
+
+    statements = [0]
+    for sync_engine in (database.engine, database.read_engine, database.async_engine.sync_engine):
+        event.listen(sync_engine, "before_cursor_execute", lambda *args: statements.__setitem__(0, statements[0] + 1))
+
+    # Build the similarity index up front so find_similar_cases times queries only
+    mcp_server.similarity_index.sync()
+
+    rng = random.Random(seed)
+    results = {}
+    tools = tool_specs(rng, n_clients, n_lawyers, n_cases)
+    registered = [tool.name for tool in asyncio.run(mcp_server.mcp.list_tools())]
+    for name in registered:
+        if name not in tools:
+            print(f"⚠️  no benchmark spec for tool {name}", file=sys.stderr)
+
+    async def run_tools():
+        for name, (make_args, heavy) in tools.items():
+            if name in skip or name not in registered:
+                continue
+            fn = getattr(mcp_server, name)
+            latencies, before, rss_start = [], statements[0], start_rss_window()
+            for _ in range(heavy_iterations if heavy else iterations):
+                kwargs = make_args()
+                start = time.perf_counter()
+                await fn(**kwargs)
+                latencies.append(time.perf_counter() - start)
+            results[name] = summarize(latencies, statements[0] - before, rss_start)
+            print(f"  {name:<24} p50 {results[name]['p50_ms']:>9.2f} ms", file=sys.stderr)
+    asyncio.run(run_tools())
+
+    client = TestClient(main.app, follow_redirects=False)
+    for name, (method, path, make_form, heavy) in route_specs(rng, n_clients, n_lawyers).items():
+        if name in skip:
+            continue
+        latencies, before, rss_start = [], statements[0], start_rss_window()
+        for _ in range(heavy_iterations if heavy else iterations):
+            form = make_form()
+            start = time.perf_counter()
+            response = client.request(method, path, data=form)
+            latencies.append(time.perf_counter() - start)
+            if response.status_code >= 400:
+                raise RuntimeError(f"{name} returned {response.status_code}")
+        results[name] = summarize(latencies, statements[0] - before, rss_start)
+        print(f"  {name:<24} p50 {results[name]['p50_ms']:>9.2f} ms", file=sys.stderr)
+
+    return {
+        "db": os.path.basename(db_path),
+        "cases": n_cases,
+        "clients": n_clients,
+        "lawyers": n_lawyers,
+        "iterations": iterations,
+        "peak_rss_mb": round(peak_rss_mb(), 1),
+        "results": results,
+    }
+
+def run_database(db_path, args):
+    """Run one database in a child process, on a scratch copy by default."""
+    with tempfile.TemporaryDirectory() as tmp:
+        target = os.path.abspath(db_path)
+        if not args.in_place:
+            target = os.path.join(tmp, os.path.basename(db_path))
+            shutil.copyfile(db_path, target)
+        command = [sys.executable, os.path.abspath(__file__), "--single", target,
+                   "--iterations", str(args.iterations), "--heavy-iterations", str(args.heavy_iterations),
+                   "--seed", str(args.seed)]
+        if args.skip:
+            command += ["--skip", args.skip]
+        output = subprocess.run(command, check=True, stdout=subprocess.PIPE, text=True).stdout
+    run = json.loads(output)
+    run["db"] = os.path.basename(db_path)
+    return run
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=REPO,
+                              stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True).stdout.strip()
+    except OSError:
+        return None
+
+def compare(old_path, new_path):
+    """Print per-benchmark p50/p95 changes between two result files."""
+    with open(old_path) as f:
+        old = {(run["cases"], name): stats for run in json.load(f)["runs"] for name, stats in run["results"].items()}
+    with open(new_path) as f:
+        new_runs = json.load(f)["runs"]
+    print(f"{'cases':>10} {'benchmark':<24} {'p50 old':>10} {'p50 new':>10} {'Δ':>8} {'p95 old':>10} {'p95 new':>10} {'Δ':>8}")
+    for run in new_runs:
+        for name, stats in run["results"].items():
+            before = old.get((run["cases"], name))
+            if before is None:
+                continue
+            change = lambda key: (stats[key] - before[key]) / before[key] * 100 if before[key] else 0.0
+            print(f"{run['cases']:>10,} {name:<24} {before['p50_ms']:>10.2f} {stats['p50_ms']:>10.2f} {change('p50_ms'):>+7.0f}%"
+                  f" {before['p95_ms']:>10.2f} {stats['p95_ms']:>10.2f} {change('p95_ms'):>+7.0f}%")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("databases", nargs="*", help="Databases made by generate_dataset.py")
+    parser.add_argument("--iterations", type=int, default=200, help="Calls per benchmark")
+    parser.add_argument("--heavy-iterations", type=int, default=5,
+                        help="Calls for the full-table benchmarks (get_all_*, GET /)")
+    parser.add_argument("--skip", default="", help="Comma-separated tools or routes to leave out")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--in-place", action="store_true", help="Write to the databases instead of copies")
+    parser.add_argument("--out", default="bench_results.json")
+    parser.add_argument("--compare", nargs=2, metavar=("OLD", "NEW"))
+    parser.add_argument("--single", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.compare:
+        compare(*args.compare)
+    elif args.single:
+        # Keep stdout for the JSON result; startup messages go to stderr
+        result_stream, sys.stdout = sys.stdout, sys.stderr
+        skip = set(filter(None, args.skip.split(",")))
+        result = run_single(args.single, args.iterations, args.heavy_iterations, skip, args.seed)
+        result_stream.write(json.dumps(result))
+    else:
+        if not args.databases:
+            parser.error("pass at least one database, or --compare OLD NEW")
+        runs = []
+        for db_path in args.databases:
+            print(f"📊 {db_path}", file=sys.stderr)
+            runs.append(run_database(db_path, args))
+        with open(args.out, "w") as f:
+            json.dump({
+                "started": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+                "commit": git_commit(),
+                "python": sys.version.split()[0],
+                "runs": runs,
+            }, f, indent=2)
+        print(f"✅ Results saved to {args.out}", file=sys.stderr)
@@ -0,0 +1,61 @@
+# Writes/sec with 50 concurrent writers: every writer committing its own
+# transaction (the old path) against the single writer with group commit,
+# on a scratch database. --synchronous FULL makes each commit fsync, which
+# is where sharing commits pays off most.
+#
+#   python benchmarks/bench_write_queue.py --writers 50 --writes 200
+import argparse
+import os
+import sys
+import tempfile
+import threading
+import time
+
+parser = argparse.ArgumentParser()
+parser.add_argument("--writers", type=int, default=50)
+parser.add_argument("--writes", type=int, default=200, help="Writes per writer")
+parser.add_argument("--synchronous", default="NORMAL", choices=["OFF", "NORMAL", "FULL"])
+parser.add_argument("--window-ms", type=float, help="Group commit window (default LEGAL_WRITE_WINDOW_MS)")
+args = parser.parse_args()
+
+tmp = tempfile.TemporaryDirectory()
+os.environ["LEGAL_DB_URL"] = f"sqlite:///{tmp.name}/bench.db"
+os.environ["LEGAL_DB_SYNCHRONOUS"] = args.synchronous
+os.environ["LEGAL_SLOW_QUERY_MS"] = "-1"
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import insert
+from database import engine
+from migrations import migrate
+from writer import WRITE_WINDOW_MS, WriteQueue
+import models
+
+def direct_write(job):
+    with engine.begin() as conn:
+        return job(conn)
+
+def measure(name, write):
+    def writer(n):
+        for i in range(args.writes):
+            write(lambda conn: conn.execute(
+                insert(models.Client).values(name=f"Writer {n}", contact=f"{i}")
+            ).inserted_primary_key[0])
+
+    threads = [threading.Thread(target=writer, args=(n,)) for n in range(args.writers)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+    total = args.writers * args.writes
+    print(f"{name:>26}: {total / elapsed:8.0f} writes/s")
+
+if __name__ == "__main__":
+    migrate()
+    print(f"{args.writers} writers x {args.writes} writes, synchronous={args.synchronous}")
+    measure("commit per write", direct_write)
+    queue = WriteQueue(bind=engine, window_ms=WRITE_WINDOW_MS if args.window_ms is None else args.window_ms)
+    measure("single writer, group commit", lambda job: queue.submit(job).result())
+    stats = queue.stats()
+    print(f"{'':>26}  {stats['batches']} commits, {stats['mean_batch_size']} writes per commit")
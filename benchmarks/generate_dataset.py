@@ -0,0 +1,151 @@
+# Build a synthetic legal.db of a given size for benchmarking.
+#
+# Cases per client and per lawyer follow a Zipf-like skew, so a few clients
+# and lawyers own a large share of the cases as in a real practice; status
+# and specialization are skewed the same way. Tables are bulk loaded first
+# and the migrations (indexes, FTS) run afterwards, which is much faster
+# than maintaining them row by row.
+#
+#   python benchmarks/generate_dataset.py --cases 100000 --out bench_100k.db
+#   python benchmarks/generate_dataset.py --preset all   # 10k, 100k, 1M, 10M
+import argparse
+import itertools
+import os
+import random
+import sqlite3
+import sys
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from database import Base, create_db_engine
+from migrations import migrate
+import models  # noqa: F401  (registers the tables on Base)
+
+PRESETS = {"10k": 10_000, "100k": 100_000, "1m": 1_000_000, "10m": 10_000_000}
+BATCH = 50_000
+
+SPECIALIZATIONS = [
+    ("Criminal Law", 30), ("Corporate Law", 20), ("Family Law", 15), ("Tax Law", 10),
+    ("Real Estate Law", 8), ("Immigration Law", 6), ("Labor Law", 5),
+    ("Intellectual Property", 3), ("Cyber Law", 2), ("Environmental Law", 1),
+]
+STATUSES = [("Closed", 55), ("Open", 25), ("In Progress", 15), ("Appealed", 5)]
+SUBJECTS = {
+    "Criminal Law": ["Theft", "Assault", "Fraud", "Shoplifting", "Burglary", "Cheating"],
+    "Corporate Law": ["Merger", "Acquisition", "Shareholder Dispute", "Breach of Contract"],
+    "Family Law": ["Divorce", "Custody", "Alimony", "Adoption", "Inheritance"],
+    "Tax Law": ["Income Tax Evasion", "GST Audit", "Tax Refund", "Transfer Pricing"],
+    "Real Estate Law": ["Property Dispute", "Tenancy", "Land Acquisition", "Encroachment"],
+    "Immigration Law": ["Visa Rejection", "Deportation", "Work Permit", "Citizenship"],
+    "Labor Law": ["Wrongful Termination", "Wage Dispute", "Workplace Harassment"],
+    "Intellectual Property": ["Trademark Infringement", "Patent Dispute", "Copyright Claim"],
+    "Cyber Law": ["Data Breach", "Online Fraud", "Identity Theft", "Defamation Online"],
+    "Environmental Law": ["Pollution Notice", "Forest Clearance", "Waste Disposal"],
+}
+PLACES = ["Andheri", "Bandra", "Pune", "Chennai", "Delhi", "Kolkata", "Bengaluru",
+          "Hyderabad", "Jaipur", "Lucknow", "Nagpur", "Surat", "Indore", "Kochi"]
+FIRST_NAMES = ["Aarav", "Priya", "Rohan", "Ananya", "Vikram", "Meera", "Arjun", "Kavya",
+               "Rahul", "Sneha", "Karan", "Divya", "Aditya", "Pooja", "Nikhil", "Isha"]
+LAST_NAMES = ["Sharma", "Iyer", "Patel", "Reddy", "Singh", "Gupta", "Nair", "Mehta",
+              "Das", "Kapoor", "Joshi", "Rao", "Khan", "Bose", "Menon", "Verma"]
+
+def zipf_cum_weights(n, s=1.1):
+    """Cumulative Zipf weights, so id 1 is the busiest and the tail is long."""
+    return list(itertools.accumulate(1 / (rank ** s) for rank in range(1, n + 1)))
+
+def weighted(pairs):
+    values, weights = zip(*pairs)
+    return list(values), list(itertools.accumulate(weights))
+
+def person(rng):
+    return f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}"
+
+def generate(path, n_cases, seed=42):
+    if os.path.exists(path):
+        raise SystemExit(f"{path} already exists")
+    rng = random.Random(seed)
+    n_clients = max(10, n_cases // 5)
+    n_lawyers = max(10, n_cases // 200)
+    start = time.perf_counter()
+
+    db_engine = create_db_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(bind=db_engine)
+    db_engine.dispose()
+
+    conn = sqlite3.connect(path)
+    conn.execute("PRAGMA journal_mode = OFF")
+    conn.execute("PRAGMA synchronous = OFF")
+
+    conn.executemany(
+        "INSERT INTO clients (id, name, contact) VALUES (?, ?, ?)",
+        ((i, person(rng), f"client{i}@example.com") for i in range(1, n_clients + 1)),
+    )
+    specializations, specialization_weights = weighted(SPECIALIZATIONS)
+    lawyer_specialization = rng.choices(specializations, cum_weights=specialization_weights, k=n_lawyers)
+    conn.executemany(
+        "INSERT INTO lawyers (id, name, specialization) VALUES (?, ?, ?)",
+        ((i + 1, f"Adv. {person(rng)}", lawyer_specialization[i]) for i in range(n_lawyers)),
+    )
+
+    client_weights = zipf_cum_weights(n_clients)
+    lawyer_weights = zipf_cum_weights(n_lawyers)
+    statuses, status_weights = weighted(STATUSES)
+    epoch = datetime(2019, 1, 1)
+    span_seconds = int((datetime(2025, 1, 1) - epoch).total_seconds())
+
+    for first in range(1, n_cases + 1, BATCH):
+        k = min(BATCH, n_cases - first + 1)
+        client_ids = rng.choices(range(1, n_clients + 1), cum_weights=client_weights, k=k)
+        lawyer_ids = rng.choices(range(1, n_lawyers + 1), cum_weights=lawyer_weights, k=k)
+        case_statuses = rng.choices(statuses, cum_weights=status_weights, k=k)
+        rows = []
+        for i in range(k):
+            subject = rng.choice(SUBJECTS[lawyer_specialization[lawyer_ids[i] - 1]])
+            place = rng.choice(PLACES)
+            created = epoch + timedelta(seconds=span_seconds * (first - 1 + i) // n_cases + rng.randrange(3600))
+            rows.append((
+                first + i,
+                f"{subject} at {place}",
+                f"{subject} matter filed in {place} on behalf of the client",
+                case_statuses[i],
+                client_ids[i],
+                lawyer_ids[i],
+                created.strftime("%Y-%m-%d %H:%M:%S.%f"),
+                f"Hearing {rng.randint(1, 12)} of {subject.lower()} proceedings; file no. {rng.randint(1000, 99999)}",
+            ))
+        conn.executemany(
+            "INSERT INTO cases (id, title, description, status, client_id, lawyer_id, date_created, case_details)"
+            " VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            rows,
+        )
+        conn.commit()
+        print(f"  {first + k - 1:>10,} / {n_cases:,} cases", end="\r", flush=True)
+    print()
+    conn.close()
+
+    db_engine = create_db_engine(f"sqlite:///{path}")
+    migrate(bind=db_engine)
+    db_engine.dispose()
+    print(f"✅ {path}: {n_cases:,} cases, {n_clients:,} clients, {n_lawyers:,} lawyers "
+          f"in {time.perf_counter() - start:.0f}s")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--cases", type=int, help="Number of cases to generate")
+    parser.add_argument("--preset", choices=list(PRESETS) + ["all"], help="Named size, or all of them")
+    parser.add_argument("--out", help="Output path (default bench_<size>.db)")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    if args.preset == "all":
+        sizes = list(PRESETS.items())
+    elif args.preset:
+        sizes = [(args.preset, PRESETS[args.preset])]
+    elif args.cases:
+        sizes = [(str(args.cases), args.cases)]
+    else:
+        parser.error("pass --cases or --preset")
+    for name, n_cases in sizes:
+        generate(args.out if args.out and len(sizes) == 1 else f"bench_{name}.db", n_cases, args.seed)
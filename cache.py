@@ -0,0 +1,78 @@
+import os
+import threading
+import time
+from collections import OrderedDict
+
+class EntityCache:
+    """Bounded LRU cache with a per-entry TTL for entity lookups by ID.
+
+    Entries are keyed by (kind, id), e.g. ("case", 3). Values are the plain
+    dicts the tools return; callers get a shallow copy so they can't mutate
+    what is cached.
+    """
+    def __init__(self, max_entries=10000, ttl_seconds=300.0, enabled=True):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.enabled = enabled
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, kind, entity_id):
+        """Return the cached dict for an entity, or None on a miss."""
+        if not self.enabled:
+            return None
+        key = (kind, entity_id)
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None or entry[0] < time.monotonic():
+                if entry is not None:
+                    del self.entries[key]
+                self.misses += 1
+                return None
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return dict(entry[1])
+
+    def put(self, kind, entity_id, value):
+        """Cache an entity dict, evicting the least recently used if full."""
+        if not self.enabled:
+            return
+        with self.lock:
+            self.entries[(kind, entity_id)] = (time.monotonic() + self.ttl_seconds, dict(value))
+            self.entries.move_to_end((kind, entity_id))
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, kind, entity_id):
+        """Drop one entity from the cache."""
+        with self.lock:
+            self.entries.pop((kind, entity_id), None)
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+
+    def stats(self):
+        """Return hit/miss/eviction counters and current size."""
+        with self.lock:
+            return {
+                "enabled": self.enabled,
+                "size": len(self.entries),
+                "max_entries": self.max_entries,
+                "ttl_seconds": self.ttl_seconds,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
+
+# Shared cache for the get_*_by_id tools. Configure with LEGAL_CACHE_ENABLED,
+# LEGAL_CACHE_MAX_ENTRIES and LEGAL_CACHE_TTL_SECONDS.
+entity_cache = EntityCache(
+    max_entries=int(os.getenv("LEGAL_CACHE_MAX_ENTRIES", 10000)),
+    ttl_seconds=float(os.getenv("LEGAL_CACHE_TTL_SECONDS", 300)),
+    enabled=os.getenv("LEGAL_CACHE_ENABLED", "1").lower() not in ("0", "false", "no"),
+)
@@ -1,9 +1,219 @@
-from sqlalchemy import create_engine
+import contextvars
+import json
+import logging
+import os
+import threading
+import time
+from sqlalchemy import create_engine, event
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 
-DATABASE_URL = "sqlite:///./legal.db"
+DATABASE_URL = os.getenv("LEGAL_DB_URL", "sqlite:///./legal.db")
 
-engine = create_engine(DATABASE_URL, connect_args={"check_same_thread": False})
+# Connection pragmas applied to every new SQLite connection. Each one can be
+# overridden with LEGAL_DB_<NAME>, e.g. LEGAL_DB_BUSY_TIMEOUT=10000.
+DEFAULT_PRAGMAS = {
+    "journal_mode": "WAL",          # readers don't block the writer and vice versa
+    "synchronous": "NORMAL",        # fsync at checkpoints only; safe with WAL
+    "busy_timeout": 5000,           # ms to wait on a lock before "database is locked"
+    "mmap_size": 256 * 1024 * 1024, # bytes of the file read through mmap
+    "cache_size": -64000,           # negative = KiB, so ~64 MB page cache
+    "foreign_keys": "ON",
+}
+
+# Statements slower than this are logged with their query plan (-1 = off)
+SLOW_QUERY_MS = float(os.getenv("LEGAL_SLOW_QUERY_MS", 100))
+# Optional file to append slow-query entries to, one JSON object per line
+SLOW_QUERY_LOG = os.getenv("LEGAL_SLOW_QUERY_LOG", "")
+# Distinct statements whose plan is kept; plans are captured once each
+MAX_CACHED_PLANS = 1000
+
+# Name of the MCP tool running in the current task, for attributing queries
+current_tool = contextvars.ContextVar("current_tool", default=None)
+
+slow_query_logger = logging.getLogger("legal.slow_queries")
+if SLOW_QUERY_LOG:
+    slow_query_logger.addHandler(logging.FileHandler(SLOW_QUERY_LOG))
+    slow_query_logger.propagate = False
+
+def pragmas_from_env(defaults=DEFAULT_PRAGMAS):
+    """Return the pragma profile with LEGAL_DB_<NAME> overrides applied."""
+    return {
+        name: os.getenv(f"LEGAL_DB_{name.upper()}", value)
+        for name, value in defaults.items()
+    }
+
+def engine_options(url, pool_size=None, max_overflow=None):
+    """Keyword arguments shared by the sync and async engines."""
+    options = {"connect_args": {"check_same_thread": False}}
+    if url.startswith("sqlite") and ":memory:" not in url:
+        # SQLite connections are cheap but each one owns its page cache and
+        # mmap, so keep a small warm pool and let bursts overflow briefly.
+        options.update(
+            pool_size=int(pool_size or os.getenv("LEGAL_DB_POOL_SIZE", 8)),
+            max_overflow=int(max_overflow or os.getenv("LEGAL_DB_MAX_OVERFLOW", 16)),
+            pool_pre_ping=False,
+        )
+    return options
+
+def read_only_url(url):
+    """The same SQLite file database, opened read-only (mode=ro)."""
+    if not url.startswith("sqlite") or ":memory:" in url or ":///" not in url:
+        return url
+    prefix, path = url.split(":///", 1)
+    return f"{prefix}:///file:{path}?mode=ro&uri=true"
+
+def database_file(url=None):
+    """Absolute path of a SQLite file database URL, or None for anything else."""
+    url = url or DATABASE_URL
+    if not url.startswith("sqlite") or ":memory:" in url or ":///" not in url:
+        return None
+    return os.path.abspath(url.split(":///", 1)[1])
+
+def install_pragmas(sync_engine, pragmas):
+    """Apply the pragma profile to every new connection of an engine."""
+    @event.listens_for(sync_engine, "connect")
+    def apply_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        for name, value in pragmas.items():
+            cursor.execute(f"PRAGMA {name} = {value}")
+        cursor.close()
+
+def parameter_shape(parameters, executemany=False):
+    """Describe bound parameters by type only, never by value."""
+    if executemany:
+        rows = list(parameters)
+        return {"rows": len(rows), "each": parameter_shape(rows[0]) if rows else None}
+    if isinstance(parameters, dict):
+        return {key: type(value).__name__ for key, value in parameters.items()}
+    return [type(value).__name__ for value in parameters or ()]
+
+def full_scans(plan):
+    """Tables the plan reads in full, without an index or the FTS index."""
+    tables = []
+    for detail in plan:
+        if detail.startswith("SCAN ") and not any(
+            marker in detail for marker in ("USING", "VIRTUAL TABLE", "CONSTANT ROW", "(subquery", "SUBQUERY")
+        ):
+            tables.append(detail.split()[1])
+    return tables
+
+class SlowQueryLog:
+    """Logs statements slower than a threshold, with their query plan.
+
+    EXPLAIN QUERY PLAN runs once per distinct statement, on the connection
+    that ran it, and only after the statement has already proved slow, so
+    fast traffic pays just the two timing hooks.
+    """
+    def __init__(self, threshold_ms=SLOW_QUERY_MS):
+        self.threshold_ms = threshold_ms
+        self.plans = {}
+        self.lock = threading.Lock()
+
+    def install(self, sync_engine):
+        if self.threshold_ms < 0:
+            return
+
+        @event.listens_for(sync_engine, "before_cursor_execute")
+        def start_timer(conn, cursor, statement, parameters, context, executemany):
+            conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+        @event.listens_for(sync_engine, "after_cursor_execute")
+        def check_duration(conn, cursor, statement, parameters, context, executemany):
+            elapsed_ms = (time.perf_counter() - conn.info["query_start"].pop()) * 1000
+            if elapsed_ms >= self.threshold_ms:
+                self.record(conn, statement, parameters, executemany, elapsed_ms)
+
+        @event.listens_for(sync_engine, "handle_error")
+        def drop_timer(exception_context):
+            starts = exception_context.connection.info.get("query_start") if exception_context.connection is not None else None
+            if starts:
+                starts.pop()
+
+    def plan_for(self, conn, statement, parameters, executemany):
+        """Cached EXPLAIN QUERY PLAN details for a statement, if it has one."""
+        with self.lock:
+            if statement in self.plans:
+                return self.plans[statement]
+        plan = []
+        if statement.lstrip().split(None, 1)[0].upper() in ("SELECT", "WITH", "INSERT", "UPDATE", "DELETE"):
+            if executemany:
+                parameters = parameters[0] if parameters else ()
+            cursor = conn.connection.dbapi_connection.cursor()
+            try:
+                cursor.execute("EXPLAIN QUERY PLAN " + statement, parameters)
+                plan = [row[-1] for row in cursor.fetchall()]
+            except Exception as e:
+                plan = [f"EXPLAIN failed: {e}"]
+            finally:
+                cursor.close()
+        with self.lock:
+            if len(self.plans) >= MAX_CACHED_PLANS:
+                self.plans.pop(next(iter(self.plans)))
+            self.plans[statement] = plan
+        return plan
+
+    def record(self, conn, statement, parameters, executemany, elapsed_ms):
+        plan = self.plan_for(conn, statement, parameters, executemany)
+        slow_query_logger.warning(json.dumps({
+            "ms": round(elapsed_ms, 2),
+            "tool": current_tool.get(),
+            "statement": " ".join(statement.split()),
+            "params": parameter_shape(parameters, executemany),
+            "plan": plan,
+            "full_scan": full_scans(plan),
+        }))
+
+slow_query_log = SlowQueryLog()
+
+def connection_pragmas(pragmas, read_only):
+    pragmas = pragmas_from_env() if pragmas is None else dict(pragmas)
+    if read_only:
+        # The journal mode is stored in the file and set by the writer
+        pragmas.pop("journal_mode", None)
+    return pragmas
+
+def create_db_engine(url=None, pragmas=None, pool_size=None, max_overflow=None, read_only=False):
+    """Create a SQLite engine with the tuning profile applied on connect.
+
+    Args:
+        url: Database URL; defaults to LEGAL_DB_URL or ./legal.db.
+        pragmas: Pragma values to apply; defaults to the env-adjusted profile.
+        pool_size: Connections kept open (LEGAL_DB_POOL_SIZE, default 8).
+        max_overflow: Extra connections allowed under burst (LEGAL_DB_MAX_OVERFLOW, default 16).
+        read_only: Open connections with mode=ro, so they can never write.
+    """
+    url = url or DATABASE_URL
+    if read_only:
+        url = read_only_url(url)
+    new_engine = create_engine(url, **engine_options(url, pool_size, max_overflow))
+    install_pragmas(new_engine, connection_pragmas(pragmas, read_only))
+    slow_query_log.install(new_engine)
+    return new_engine
+
+def create_async_db_engine(url=None, pragmas=None, pool_size=None, max_overflow=None, read_only=False):
+    """Create the asyncio counterpart of create_db_engine over aiosqlite.
+
+    Takes the same arguments. A plain ``sqlite://`` URL is switched to the
+    ``sqlite+aiosqlite://`` driver.
+    """
+    url = url or DATABASE_URL
+    if url.startswith("sqlite://"):
+        url = "sqlite+aiosqlite://" + url[len("sqlite://"):]
+    if read_only:
+        url = read_only_url(url)
+    new_engine = create_async_engine(url, **engine_options(url, pool_size, max_overflow))
+    install_pragmas(new_engine.sync_engine, connection_pragmas(pragmas, read_only))
+    slow_query_log.install(new_engine.sync_engine)
+    return new_engine
+
+# engine is for migrations and the single writer (writer.py); every read
+# goes through the read-only pools below.
+engine = create_db_engine()
 SessionLocal = sessionmaker(bind=engine)
+read_engine = create_db_engine(read_only=True)
+ReadSessionLocal = sessionmaker(bind=read_engine)
+async_engine = create_async_db_engine(read_only=True)
+AsyncSessionLocal = async_sessionmaker(bind=async_engine, expire_on_commit=False)
 Base = declarative_base()
@@ -0,0 +1,145 @@
+import json
+import os
+from typing import Dict, List, Optional
+
+RESPONSE_FORMATS = ("rows", "compact")
+
+# Server-wide default for tools that take response_format
+DEFAULT_RESPONSE_FORMAT = os.getenv("LEGAL_RESPONSE_FORMAT", "rows")
+
+# Columns whose values repeat across rows; in the compact format each
+# distinct value is sent once and the rows carry its index instead.
+DICTIONARY_COLUMNS = {
+    "status", "specialization",
+    "client_name", "client_contact", "lawyer_name", "lawyer_specialization",
+}
+
+def json_size(value) -> int:
+    """Size in bytes of a value as minified JSON."""
+    return len(json.dumps(value, separators=(",", ":"), default=str).encode())
+
+def to_compact(rows: List[Dict]) -> Dict:
+    """Encode a list of same-shaped dicts as a columns/rows table.
+
+    Keys are listed once in "columns" and each row becomes a list of values.
+    DICTIONARY_COLUMNS are dictionary-encoded: "dictionaries" holds the
+    distinct values per column and the row cell holds the index into it.
+    "bytes" reports how many bytes of minified JSON this saves over the rows
+    format, without serializing either payload.
+    """
+    columns = list(rows[0]) if rows else []
+    dictionaries = {name: [] for name in columns if name in DICTIONARY_COLUMNS}
+    positions = {name: {} for name in dictionaries}
+    uses = {name: [] for name in dictionaries}
+    encoded = []
+    for row in rows:
+        values = []
+        for name in columns:
+            value = row.get(name)
+            if name in positions:
+                lookup = positions[name]
+                index = lookup.get(value)
+                if index is None:
+                    index = lookup[value] = len(dictionaries[name])
+                    dictionaries[name].append(value)
+                    uses[name].append(0)
+                uses[name][index] += 1
+                value = index
+            values.append(value)
+        encoded.append(values)
+
+    compact = {"columns": columns, "rows": encoded, "dictionaries": dictionaries}
+    compact["bytes"] = {"saved": compact_savings(len(rows), columns, dictionaries, uses)}
+    return compact
+
+def compact_savings(row_count, columns, dictionaries, uses) -> int:
+    """Bytes of minified JSON the compact format saves over the rows format.
+
+    Cells outside DICTIONARY_COLUMNS encode the same either way, so the
+    saving is the keys every row repeats plus each dictionary-encoded cell's
+    value minus its index, less the columns and dictionaries sent once.
+    Only distinct values are sized.
+    """
+    saved = row_count * sum(json_size(name) + 1 for name in columns)
+    for name, values in dictionaries.items():
+        saved += sum(
+            count * (json_size(value) - len(str(index)))
+            for index, (value, count) in enumerate(zip(values, uses[name]))
+        )
+    return saved - (json_size({"columns": columns, "rows": [], "dictionaries": dictionaries}) - 2)
+
+def format_rows(rows: List[Dict], response_format: Optional[str] = None):
+    """Return rows as-is or in the compact format, per call or server default.
+
+    Raises:
+        ValueError: If the format is not one of RESPONSE_FORMATS.
+    """
+    response_format = response_format or DEFAULT_RESPONSE_FORMAT
+    if response_format not in RESPONSE_FORMATS:
+        raise ValueError(f"response_format must be one of: {', '.join(RESPONSE_FORMATS)}")
+    return rows if response_format == "rows" else to_compact(rows)
+
+# Rough JSON bytes per LLM token, used to turn a token budget into bytes
+BYTES_PER_TOKEN = 4
+
+def estimate_row_bytes(row: Dict) -> int:
+    """Cheap estimate of a row's size as minified JSON, without encoding it.
+
+    Counts key and value lengths plus quoting and separators, which is close
+    enough to budget a response without serializing every row twice.
+    """
+    size = 2
+    for key, value in row.items():
+        size += len(key) + 4
+        if value is None or isinstance(value, bool):
+            size += 5
+        elif isinstance(value, (int, float)):
+            size += len(repr(value))
+        else:
+            size += len(str(value)) + 2
+    return size
+
+def budget_bytes(max_tokens: Optional[int], max_bytes: Optional[int]) -> Optional[int]:
+    """Combine token and byte budgets into one byte limit (None = unlimited).
+
+    Raises:
+        ValueError: If a budget is not positive.
+    """
+    limits = []
+    if max_tokens is not None:
+        if max_tokens < 1:
+            raise ValueError("max_tokens must be at least 1")
+        limits.append(max_tokens * BYTES_PER_TOKEN)
+    if max_bytes is not None:
+        if max_bytes < 1:
+            raise ValueError("max_bytes must be at least 1")
+        limits.append(max_bytes)
+    return min(limits) if limits else None
+
+def estimate_json_bytes(value) -> int:
+    """Cheap estimate of any tool result's size as minified JSON."""
+    if isinstance(value, dict):
+        return 2 + sum(len(str(key)) + 4 + estimate_json_bytes(item) for key, item in value.items())
+    if isinstance(value, (list, tuple)):
+        return 2 + sum(estimate_json_bytes(item) + 1 for item in value)
+    if value is None or isinstance(value, bool):
+        return 5
+    if isinstance(value, (int, float)):
+        return len(repr(value))
+    return len(str(value)) + 2
+
+# Items of a long list that sample_json_bytes sizes before extrapolating
+SIZE_SAMPLE_ITEMS = 100
+
+def sample_json_bytes(value, sample=SIZE_SAMPLE_ITEMS) -> int:
+    """Like estimate_json_bytes, but in bounded time for results of any length.
+
+    Lists longer than `sample` are sized from their first `sample` items
+    and scaled up, so a 100k-row result costs the same as a 100-row one.
+    """
+    if isinstance(value, dict):
+        return 2 + sum(len(str(key)) + 4 + sample_json_bytes(item, sample) for key, item in value.items())
+    if isinstance(value, (list, tuple)):
+        head = sum(sample_json_bytes(item, sample) + 1 for item in value[:sample])
+        return 2 + (head if len(value) <= sample else head * len(value) // sample)
+    return estimate_json_bytes(value)
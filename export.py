@@ -0,0 +1,173 @@
+import argparse
+import csv
+import gzip
+import io
+import json
+import os
+import time
+from sqlalchemy import Integer
+from database import read_engine
+from serializers import CASE_FIELDS, case_select
+
+EXPORT_FORMATS = ("jsonl", "csv", "parquet")
+COMPRESSIONS = ("gzip", "zstd")
+
+# Rows fetched from the cursor and written per batch; memory use is bounded
+# by one batch whatever the table size.
+EXPORT_BATCH_SIZE = int(os.getenv("LEGAL_EXPORT_BATCH_SIZE", 5000))
+
+# Where the export_cases MCP tool writes; callers only choose the file name
+EXPORT_DIR = os.getenv("LEGAL_EXPORT_DIR", "exports")
+
+# Every case field, with client and lawyer details joined in
+EXPORT_FIELDS = list(CASE_FIELDS)
+
+# Fields SQLite hands back as text ("2025-06-11 13:31:12.857918") that
+# Parquet stores as timestamps
+PARQUET_TIMESTAMPS = {"created_at"}
+
+def case_batches(fields, batch_size=EXPORT_BATCH_SIZE, bind=read_engine):
+    """Yield (keys, rows) batches of joined case rows from a streaming cursor.
+
+    yield_per keeps the driver cursor open and fetches batch_size rows at a
+    time, so rows are never all held in memory at once.
+    """
+    with bind.connect() as conn:
+        result = conn.execution_options(yield_per=batch_size).execute(case_select(fields))
+        keys = list(result.keys())
+        for rows in result.partitions():
+            yield keys, rows
+
+def open_text(path, compression):
+    """Open an output file for text, compressing as it is written."""
+    if compression == "gzip":
+        return gzip.open(path, "wt", encoding="utf-8", newline="")
+    if compression == "zstd":
+        zstandard = require("zstandard", "zstd compression")
+        raw = open(path, "wb")
+        writer = zstandard.ZstdCompressor().stream_writer(raw, closefd=True)
+        return io.TextIOWrapper(writer, encoding="utf-8", newline="")
+    return open(path, "w", encoding="utf-8", newline="")
+
+def require(module, feature):
+    """Import an optional dependency, explaining what needs it if missing."""
+    try:
+        return __import__(module)
+    except ImportError:
+        raise ValueError(f"{feature} needs the '{module}' package: pip install {module}")
+
+def write_jsonl(path, compression, batches):
+    count = 0
+    with open_text(path, compression) as out:
+        for keys, rows in batches:
+            for row in rows:
+                out.write(json.dumps(dict(zip(keys, row)), default=str))
+                out.write("\n")
+            count += len(rows)
+    return count
+
+def write_csv(path, compression, batches):
+    count = 0
+    with open_text(path, compression) as out:
+        writer = csv.writer(out)
+        for keys, rows in batches:
+            if count == 0:
+                writer.writerow(keys)
+            writer.writerows(rows)
+            count += len(rows)
+    return count
+
+def parquet_schema(pa, fields):
+    """Arrow schema for the exported fields, from their column types."""
+    def arrow_type(name):
+        if name in PARQUET_TIMESTAMPS:
+            return pa.timestamp("us")
+        if isinstance(CASE_FIELDS[name].type, Integer):
+            return pa.int64()
+        return pa.string()
+    names = ["id"] + [name for name in dict.fromkeys(fields) if name != "id"]
+    return pa.schema([(name, arrow_type(name)) for name in names])
+
+def parquet_array(pa, column, type):
+    """Arrow array for one column; timestamp text is parsed by Arrow's cast."""
+    if pa.types.is_timestamp(type):
+        return pa.array(column, type=pa.string()).cast(type)
+    return pa.array(column, type=type)
+
+def write_parquet(path, compression, batches, fields):
+    require("pyarrow", "Parquet export")
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    schema = parquet_schema(pa, fields)
+    count = 0
+    # Each batch becomes one row group; the codec compresses inside the file
+    with pq.ParquetWriter(path, schema, compression=compression or "snappy") as writer:
+        for keys, rows in batches:
+            columns = list(zip(*rows))
+            writer.write_table(pa.Table.from_arrays(
+                [parquet_array(pa, column, schema.field(key).type) for key, column in zip(keys, columns)],
+                schema=schema,
+            ))
+            count += len(rows)
+    return count
+
+def export_cases(path, format="jsonl", compression=None, fields=None,
+                 batch_size=EXPORT_BATCH_SIZE, bind=read_engine):
+    """Stream all cases with client and lawyer details to a file.
+
+    Args:
+        path: Output file path.
+        format: "jsonl", "csv" or "parquet".
+        compression: None, "gzip" or "zstd" (zstd needs zstandard for
+            JSONL/CSV; Parquet compresses internally and needs pyarrow).
+        fields: Case fields to export; defaults to all of CASE_FIELDS.
+        batch_size: Rows fetched and written at a time.
+
+    Returns:
+        Dict: The path, format, compression, rows written, file size in
+        bytes and seconds taken.
+
+    Raises:
+        ValueError: If the format, compression or a field is unknown, or an
+            optional dependency it needs is missing.
+    """
+    if format not in EXPORT_FORMATS:
+        raise ValueError(f"Unknown export format: {format}. Valid formats: {', '.join(EXPORT_FORMATS)}")
+    if compression is not None and compression not in COMPRESSIONS:
+        raise ValueError(f"Unknown compression: {compression}. Valid values: {', '.join(COMPRESSIONS)}")
+    fields = fields or EXPORT_FIELDS
+    case_select(fields)  # validate fields before creating the file
+
+    start = time.perf_counter()
+    batches = case_batches(fields, batch_size, bind)
+    if format == "parquet":
+        count = write_parquet(path, compression, batches, fields)
+    elif format == "csv":
+        count = write_csv(path, compression, batches)
+    else:
+        count = write_jsonl(path, compression, batches)
+    return {
+        "path": path,
+        "format": format,
+        "compression": compression,
+        "rows": count,
+        "bytes": os.path.getsize(path),
+        "seconds": round(time.perf_counter() - start, 2),
+    }
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Export all cases with client and lawyer details.")
+    parser.add_argument("--format", choices=EXPORT_FORMATS, default="jsonl")
+    parser.add_argument("--compression", choices=COMPRESSIONS)
+    parser.add_argument("--fields", help="Comma-separated case fields (default: all)")
+    parser.add_argument("--batch-size", type=int, default=EXPORT_BATCH_SIZE)
+    parser.add_argument("--out", required=True, help="Output file")
+    args = parser.parse_args()
+
+    summary = export_cases(
+        args.out, args.format, args.compression,
+        args.fields.split(",") if args.fields else None, args.batch_size,
+    )
+    print(f"✅ Exported {summary['rows']:,} cases to {summary['path']} "
+          f"({summary['bytes']:,} bytes in {summary['seconds']}s)")
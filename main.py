@@ -1,17 +1,20 @@
 from fastapi import FastAPI, Request, Form, Depends
 from fastapi.responses import HTMLResponse, RedirectResponse
 from fastapi.templating import Jinja2Templates
+from sqlalchemy import insert
 from sqlalchemy.orm import Session
-from database import SessionLocal, engine
+from database import ReadSessionLocal
+from migrations import migrate
+from writer import write_queue
 import models
 
-models.Base.metadata.create_all(bind=engine)
+migrate()
 
 app = FastAPI()
 templates = Jinja2Templates(directory="templates")
 
 def get_db():
-    db = SessionLocal()
+    db = ReadSessionLocal()
     try:
         yield db
     finally:
@@ -22,8 +25,7 @@ def read_root(request: Request, db: Session = Depends(get_db)):
     cases = db.query(models.Case).all()
     clients = db.query(models.Client).all()
     lawyers = db.query(models.Lawyer).all()
-    return templates.TemplateResponse("index.html", {
-        "request": request,
+    return templates.TemplateResponse(request, "index.html", {
         "cases": cases,
         "clients": clients,
         "lawyers": lawyers
@@ -34,22 +36,23 @@ def add_case(
     title: str = Form(...),
     description: str = Form(...),
     client_id: int = Form(...),
-    lawyer_id: int = Form(...),
-    db: Session = Depends(get_db)
+    lawyer_id: int = Form(...)
 ):
-    case = models.Case(title=title, description=description, client_id=client_id, lawyer_id=lawyer_id)
-    db.add(case)
-    db.commit()
+    write_queue.submit(lambda conn: conn.execute(insert(models.Case).values(
+        title=title, description=description, client_id=client_id, lawyer_id=lawyer_id
+    ))).result()
     return RedirectResponse("/", status_code=303)
 
 @app.post("/add_client")
-def add_client(name: str = Form(...), contact: str = Form(...), db: Session = Depends(get_db)):
-    db.add(models.Client(name=name, contact=contact))
-    db.commit()
+def add_client(name: str = Form(...), contact: str = Form(...)):
+    write_queue.submit(lambda conn: conn.execute(
+        insert(models.Client).values(name=name, contact=contact)
+    )).result()
     return RedirectResponse("/", status_code=303)
 
 @app.post("/add_lawyer")
-def add_lawyer(name: str = Form(...), specialization: str = Form(...), db: Session = Depends(get_db)):
-    db.add(models.Lawyer(name=name, specialization=specialization))
-    db.commit()
+def add_lawyer(name: str = Form(...), specialization: str = Form(...)):
+    write_queue.submit(lambda conn: conn.execute(
+        insert(models.Lawyer).values(name=name, specialization=specialization)
+    )).result()
     return RedirectResponse("/", status_code=303)
@@ -12,6 +12,7 @@ import datetime
 import threading
 import time
 import base64
+import tracing
 
 def encode_image(path):
     with open(path, "rb") as image_file:
@@ -83,13 +84,27 @@ class AsyncRunner:
 
 async_runner = AsyncRunner()
 
+class TracedMCPClient(BasicMCPClient):
+    """MCP client that traces each tool call and sends the trace along.
+
+    The traceparent goes in the request's _meta so the server's tool and
+    SQL spans join the same trace as the chat turn.
+    """
+    async def call_tool(self, tool_name, arguments=None, progress_callback=None):
+        with tracing.span("mcp.call_tool", tool=tool_name):
+            meta = {"traceparent": tracing.current_traceparent()} if tracing.exporter.enabled else None
+            async with self._run_session() as session:
+                return await session.call_tool(
+                    tool_name, arguments=arguments, progress_callback=progress_callback, meta=meta
+                )
+
 async def initialize_agent():
     """Initialize the MCP client and agent with enhanced error handling"""
     global agent, agent_context, mcp_client
     
     try:
         # Create MCP client connection
-        mcp_client = BasicMCPClient("http://127.0.0.1:3000/sse")
+        mcp_client = TracedMCPClient("http://127.0.0.1:3000/sse")
         mcp_tool = McpToolSpec(client=mcp_client)
         
         # Get available tools
@@ -119,16 +134,22 @@ async def handle_user_message(message_content: str):
         return "🔌 Please establish connection to the legal database first."
     
     try:
-        tool_operations = []
-        handler = agent.run(message_content, ctx=agent_context)
-        
-        async for event in handler.stream_events():
-            if type(event) == ToolCall:
-                tool_operations.append(f"⚡ Executing: `{event.tool_name}`")
-            elif type(event) == ToolCallResult:
-                tool_operations.append(f"✓ Completed: `{event.tool_name}`")
-        
-        response = await handler
+        with tracing.span("handle_user_message") as turn:
+            tool_operations = []
+            tool_spans = {}
+            handler = agent.run(message_content, ctx=agent_context)
+            
+            async for event in handler.stream_events():
+                if type(event) == ToolCall:
+                    tool_operations.append(f"⚡ Executing: `{event.tool_name}`")
+                    tool_spans[event.tool_id] = tracing.start_span("ToolCall", parent=turn, tool=event.tool_name)
+                elif type(event) == ToolCallResult:
+                    tool_operations.append(f"✓ Completed: `{event.tool_name}`")
+                    tool_span = tool_spans.pop(event.tool_id, None)
+                    if tool_span is not None:
+                        tool_span.end()
+            
+            response = await handler
         
         # Enhanced response formatting
         if tool_operations:
@@ -1,104 +1,472 @@
 # mcp_legal_server.py
 from mcp.server.fastmcp import FastMCP
-from sqlalchemy.orm import Session
-from database import SessionLocal, engine
+from mcp.server.transport_security import TransportSecuritySettings
+from sqlalchemy import func, insert, literal, literal_column, select, table, column, tuple_
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.requests import Request
+from starlette.responses import PlainTextResponse, Response
+from database import AsyncSessionLocal, async_engine, engine, read_engine
+from cache import entity_cache
+from encoding import budget_bytes, estimate_row_bytes, format_rows
+from metrics import clear_shared, install_statement_counter, tool_metrics
+from tracing import install_sql_tracing, traced_tool
+from serializers import CASE_FIELDS, case_select, client_select, lawyer_select, rows_to_dicts, first_dict
 import models
+from migrations import migrate
+from search_index import FTS_TABLE, to_match_query
+from name_index import (NAME_CANDIDATES, NAME_INDEXES, index_trigrams, prefix_select, rare_trigram_query,
+                        short_word_prefixes, similarity, substring_query, typo_query, vocab_select,
+                        word_edits)
+from writer import write_queue
+from similarity import case_text, similarity_index
+import export
 import argparse
-from typing import List, Dict, Optional
+import asyncio
+import os
+from datetime import datetime, timedelta
+import base64
+import json
+from typing import List, Dict, Optional, Union
 
-# Ensure database tables are created
-models.Base.metadata.create_all(bind=engine)
+# Ensure database schema is up to date
+migrate()
+for sync_engine in (async_engine.sync_engine, read_engine, engine):
+    install_statement_counter(sync_engine)
+    install_sql_tracing(sync_engine)
 
 mcp = FastMCP("LegalDB", port=3000)
 
-def get_db():
-    """Get database session"""
-    db = SessionLocal()
+DEFAULT_PAGE_SIZE = 50
+DEFAULT_SEARCH_LIMIT = 20
+MAX_PAGE_SIZE = 500
+MAX_BULK_ROWS = 5000
+
+def encode_cursor(last_id: int) -> str:
+    """Encode the last seen primary key as an opaque page cursor."""
+    payload = json.dumps({"after": last_id}).encode()
+    return base64.urlsafe_b64encode(payload).decode()
+
+def decode_cursor(cursor: Optional[str]) -> int:
+    """Decode a page cursor back to the primary key to seek after."""
+    if not cursor:
+        return 0
+    try:
+        return int(json.loads(base64.urlsafe_b64decode(cursor.encode()))["after"])
+    except (ValueError, KeyError, TypeError):
+        raise ValueError(f"Invalid cursor: {cursor}")
+
+def encode_date_cursor(created_at: str, last_id: int) -> str:
+    """Encode the last seen (created_at, id) as an opaque page cursor."""
+    payload = json.dumps({"created_at": created_at, "after": last_id}).encode()
+    return base64.urlsafe_b64encode(payload).decode()
+
+def decode_date_cursor(cursor: Optional[str]) -> Optional[tuple]:
+    """Decode a date-ordered page cursor back to (created_at, id)."""
+    if not cursor:
+        return None
     try:
-        return db
-    finally:
-        pass  # Don't close here as we need to return the session
+        position = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        return str(position["created_at"]), int(position["after"])
+    except (ValueError, KeyError, TypeError):
+        raise ValueError(f"Invalid cursor: {cursor}")
+
+async def keyset_page(db: AsyncSession, statement, id_column, limit: int, cursor: Optional[str]):
+    """Fetch one page of rows ordered by primary key.
+
+    Seeks past the cursor with ``id > last_id`` instead of OFFSET, so every
+    page costs the same primary-key range scan. One extra row is fetched to
+    know whether another page exists.
+
+    Returns:
+        tuple: The dicts on this page and the cursor for the next one (or None).
+    """
+    if limit < 1 or limit > MAX_PAGE_SIZE:
+        raise ValueError(f"limit must be between 1 and {MAX_PAGE_SIZE}")
+    statement = (
+        statement.where(id_column > decode_cursor(cursor))
+        .order_by(id_column)
+        .limit(limit + 1)
+    )
+    rows = rows_to_dicts(await db.execute(statement))
+    if len(rows) > limit:
+        rows = rows[:limit]
+        return rows, encode_cursor(rows[-1]["id"])
+    return rows, None
+
+async def budgeted_rows(db: AsyncSession, statement, id_column, max_tokens: Optional[int],
+                        max_bytes: Optional[int], continuation: Optional[str]):
+    """Stream rows in primary-key order until a response budget is used up.
+
+    Rows are pulled from the cursor one at a time and sized with a local
+    estimate, so nothing past the budget is fetched or serialized. At least
+    one row is always returned.
+
+    Returns:
+        tuple: The row dicts, and a summary with "truncated", "continuation"
+        (pass back to get the next rows), "returned", "omitted" and
+        "total_count" -- or None when no budget or continuation was given.
+    """
+    limit = budget_bytes(max_tokens, max_bytes)
+    if limit is None and continuation is None:
+        return rows_to_dicts(await db.execute(statement)), None
+
+    after_id = decode_cursor(continuation)
+    result = await db.stream(statement.where(id_column > after_id).order_by(id_column))
+    keys = list(result.keys())
+    rows, used, truncated = [], 2, False
+    async for row in result:
+        row = dict(zip(keys, row))
+        used += estimate_row_bytes(row) + 1
+        if limit is not None and used > limit and rows:
+            truncated = True
+            break
+        rows.append(row)
+    await result.close()
+
+    summary = {"truncated": truncated, "continuation": None, "returned": len(rows), "omitted": 0}
+    if truncated or continuation:
+        last_id = rows[-1]["id"] if rows else after_id
+        matching = statement.subquery()
+        total, omitted = (await db.execute(select(
+            func.count(), func.count().filter(matching.c.id > last_id)
+        ).select_from(matching))).one()
+        summary.update(total_count=total, omitted=omitted)
+        if truncated:
+            summary["continuation"] = encode_cursor(last_id)
+    else:
+        summary["total_count"] = len(rows)
+    return rows, summary
+
+def validate_bulk_rows(rows: List[Dict], fields: Dict[str, type]):
+    """Split bulk input into well-formed rows and per-row errors.
+
+    Args:
+        rows: The rows passed to a bulk tool.
+        fields: Required field names mapped to their expected type.
+
+    Returns:
+        tuple: (index, row) pairs that passed, and error dicts for the rest.
+    """
+    if len(rows) > MAX_BULK_ROWS:
+        raise ValueError(f"At most {MAX_BULK_ROWS} rows can be added per call")
+    valid, errors = [], []
+    for index, row in enumerate(rows):
+        missing = [name for name in fields if row.get(name) is None]
+        wrong = [name for name, kind in fields.items()
+                 if name not in missing and not isinstance(row[name], kind)]
+        if missing:
+            errors.append({"index": index, "error": f"Missing fields: {', '.join(missing)}"})
+        elif wrong:
+            errors.append({"index": index, "error": f"Invalid fields: {', '.join(wrong)}"})
+        else:
+            valid.append((index, {name: row[name] for name in fields}))
+    return valid, errors
+
+def bulk_insert(conn, model, indexed_rows) -> List[Dict]:
+    """Insert rows with one executemany and return their new IDs.
+
+    Runs as a write_queue job: the writer's transaction holds SQLite's write
+    lock, and rowids are handed out as max(rowid) + 1, so the batch gets the
+    contiguous IDs ending at last_insert_rowid().
+
+    Returns:
+        List[Dict]: {"index", "id"} for each row, in input order.
+    """
+    if not indexed_rows:
+        return []
+    conn.execute(insert(model), [row for _, row in indexed_rows])
+    last_id = conn.execute(select(func.last_insert_rowid())).scalar()
+    first_id = last_id - len(indexed_rows) + 1
+    return [
+        {"index": index, "id": first_id + offset}
+        for offset, (index, _) in enumerate(indexed_rows)
+    ]
+
+async def batch_lookup(kind: str, ids: List[int], fetch, use_cache: bool = True) -> Dict:
+    """Resolve many entity IDs, serving what it can from the entity cache.
+
+    Args:
+        kind: Entity cache kind ("case", "client" or "lawyer").
+        ids: The IDs to resolve; duplicates are ignored.
+        fetch: Coroutine taking a session and the uncached IDs and returning
+            their dicts keyed by ID, using a single IN (...) query.
+        use_cache: Set to False when fetch returns partial entities.
+
+    Returns:
+        Dict: The found entities keyed by ID, and the IDs that don't exist.
+    """
+    ids = list(dict.fromkeys(ids))
+    if len(ids) > MAX_PAGE_SIZE:
+        raise ValueError(f"At most {MAX_PAGE_SIZE} IDs can be looked up per call")
+    found = {}
+    for entity_id in ids if use_cache else ():
+        cached = entity_cache.get(kind, entity_id)
+        if cached is not None:
+            found[entity_id] = cached
+    uncached = [entity_id for entity_id in ids if entity_id not in found]
+    if uncached:
+        async with AsyncSessionLocal() as db:
+            fetched = await fetch(db, uncached)
+        for entity_id, data in fetched.items() if use_cache else ():
+            entity_cache.put(kind, entity_id, data)
+        found.update(fetched)
+    return {
+        "found": {entity_id: found[entity_id] for entity_id in ids if entity_id in found},
+        "missing_ids": [entity_id for entity_id in ids if entity_id not in found]
+    }
+
+# Buckets supported by case_histogram: the period each case falls in.
+# Weeks start on Monday and are labelled with that day's date.
+HISTOGRAM_INTERVALS = {
+    "day": func.strftime("%Y-%m-%d", models.Case.date_created),
+    "week": func.date(models.Case.date_created, "weekday 0", "-6 days"),
+    "month": func.strftime("%Y-%m", models.Case.date_created),
+}
+
+# Groupings supported by count_cases: the key columns for each one
+CASE_GROUPINGS = {
+    "lawyer": [models.Case.lawyer_id.label("lawyer_id"), models.Lawyer.name.label("lawyer_name")],
+    "specialization": [models.Lawyer.specialization.label("specialization")],
+    "status": [models.Case.status.label("status")],
+    "client": [models.Case.client_id.label("client_id"), models.Client.name.label("client_name")],
+    "month": [func.strftime("%Y-%m", models.Case.date_created).label("month")],
+}
+
+async def find_by_name(kind: str, model, name: str, limit: int) -> List[Dict]:
+    """Rank clients or lawyers by how closely their name matches `name`.
+
+    Candidates come from the trigram index in up to three passes, each run
+    only while fewer than `limit` names have been found: the shortest names
+    containing every word of the query (so an exact match is never crowded
+    out by longer names that contain it), the shortest names with every word
+    at most one edit away ("Jhon" finds John, "Iyr" finds Iyer), then names
+    sharing its rarest trigrams. The candidates are ranked by how many query
+    words are within one edit of one of their words (so "Jhon" puts John
+    before Johnson), then by trigram similarity to the whole query, then by
+    the fewest edits overall.
+    """
+    if limit < 1 or limit > MAX_PAGE_SIZE:
+        raise ValueError(f"limit must be between 1 and {MAX_PAGE_SIZE}")
+    trigrams = index_trigrams(name)
+    if not trigrams:
+        raise ValueError("name must have at least 3 characters")
+
+    _, fts, vocab = NAME_INDEXES[kind]
+    fts_table = table(fts, column("rowid"))
+    fts_ref = literal_column(fts)
+    async with AsyncSessionLocal() as db:
+        ids = []
+        substring = substring_query(name)
+        if substring:
+            ids = (await db.execute(
+                select(fts_table.c.rowid)
+                .join(model, model.id == fts_table.c.rowid)
+                .where(fts_ref.op("MATCH")(substring))
+                .order_by(func.length(model.name), model.id)
+                .limit(NAME_CANDIDATES)
+            )).scalars().all()
+        if len(ids) < limit:
+            prefixes = short_word_prefixes(name)
+            prefix_terms = (await db.execute(prefix_select(vocab, prefixes))).scalars().all() if prefixes else []
+            typos = typo_query(name, prefix_terms)
+            if typos:
+                close = (await db.execute(
+                    select(fts_table.c.rowid)
+                    .join(model, model.id == fts_table.c.rowid)
+                    .where(fts_ref.op("MATCH")(typos))
+                    .order_by(func.length(model.name), model.id)
+                    .limit(NAME_CANDIDATES)
+                )).scalars().all()
+                ids = list(dict.fromkeys([*ids, *close]))
+        if len(ids) < limit:
+            doc_counts = dict((await db.execute(vocab_select(vocab, trigrams))).all())
+            if doc_counts:
+                fuzzy = (await db.execute(
+                    select(fts_table.c.rowid)
+                    .where(fts_ref.op("MATCH")(rare_trigram_query(doc_counts)))
+                    .order_by(literal_column(f"{fts}.rank"))
+                    .limit(NAME_CANDIDATES)
+                )).scalars().all()
+                ids = list(dict.fromkeys([*ids, *fuzzy]))
+        if not ids:
+            return []
+        rows = (await db.execute(select(model.id, model.name).where(model.id.in_(ids)))).all()
+
+    ranked = sorted(
+        ((similarity(name, row.name), word_edits(name, row.name), row.id, row.name) for row in rows),
+        key=lambda r: (-sum(d <= 1 for d in r[1]), -r[0], sum(r[1]), r[2]),
+    )
+    return [
+        {"id": row_id, "name": row_name, "similarity": round(score, 4)}
+        for score, _, row_id, row_name in ranked[:limit]
+        if score > 0
+    ]
+
+def parse_date(value: Optional[str], name: str) -> Optional[datetime]:
+    """Parse an ISO date/datetime tool argument."""
+    if value is None:
+        return None
+    try:
+        return datetime.fromisoformat(value)
+    except ValueError:
+        raise ValueError(f"{name} must be an ISO date like 2025-06-01, got {value!r}")
+
+def date_conditions(created_after: Optional[str], created_before: Optional[str],
+                    last_days: Optional[int] = None) -> List:
+    """WHERE conditions on cases.date_created; each is a range on its index."""
+    conditions = []
+    if last_days is not None:
+        if last_days < 1:
+            raise ValueError("last_days must be at least 1")
+        conditions.append(models.Case.date_created >= datetime.utcnow() - timedelta(days=last_days))
+    if created_after is not None:
+        conditions.append(models.Case.date_created >= parse_date(created_after, "created_after"))
+    if created_before is not None:
+        conditions.append(models.Case.date_created < parse_date(created_before, "created_before"))
+    return conditions
 
 @mcp.tool()
-def get_all_cases() -> List[Dict]:
+@tool_metrics.instrument
+@traced_tool
+async def get_all_cases(fields: Optional[List[str]] = None,
+                        response_format: Optional[str] = None,
+                        max_tokens: Optional[int] = None, max_bytes: Optional[int] = None,
+                        continuation: Optional[str] = None) -> Union[List[Dict], Dict]:
     """Gets all cases from the legal database.
     
+    Args:
+        fields: Case fields to return, e.g. ["title", "status", "client_name"].
+            Omit for the full case. The id is always included. Valid fields:
+            id, title, description, status, case_details, client_id, lawyer_id,
+            created_at, client_name, client_contact, lawyer_name, lawyer_specialization.
+        response_format: "rows" for a list of objects, or "compact" for
+            {"columns", "rows", "dictionaries"} with repeated names sent once
+            and referenced by index. Defaults to the server setting.
+        max_tokens: Stop adding cases once the response would exceed about this
+            many LLM tokens; the rest can be fetched with the continuation.
+        max_bytes: Same as max_tokens, as a limit on response bytes.
+        continuation: The continuation from a truncated response, to resume it.
+        
     Returns:
         List[Dict]: List of all cases with their details including client and lawyer information.
+        With max_tokens, max_bytes or continuation, a Dict with "cases" plus
+        "truncated", "continuation", "returned", "omitted" and "total_count".
+        
+    Raises:
+        ValueError: If an unknown field or response_format is requested, a
+            budget is not positive or the continuation is invalid.
     """
-    db = get_db()
-    try:
-        cases = db.query(models.Case).all()
-        result = []
-        for case in cases:
-            case_data = {
-                "id": case.id,
-                "title": case.title,
-                "description": case.description,
-                "client_id": case.client_id,
-                "lawyer_id": case.lawyer_id,
-                "created_at": str(case.created_at) if hasattr(case, 'created_at') else None
-            }
-            
-            # Add client information if available
-            if case.client:
-                case_data["client_name"] = case.client.name
-                case_data["client_contact"] = case.client.contact
-            
-            # Add lawyer information if available
-            if case.lawyer:
-                case_data["lawyer_name"] = case.lawyer.name
-                case_data["lawyer_specialization"] = case.lawyer.specialization
-                
-            result.append(case_data)
-        return result
-    finally:
-        db.close()
+    async with AsyncSessionLocal() as db:
+        cases, summary = await budgeted_rows(
+            db, case_select(fields), models.Case.id, max_tokens, max_bytes, continuation
+        )
+    if summary is None:
+        return format_rows(cases, response_format)
+    return {"cases": format_rows(cases, response_format), **summary}
+
+@mcp.tool()
+@tool_metrics.instrument
+@traced_tool
+async def get_cases_page(limit: int = DEFAULT_PAGE_SIZE, cursor: Optional[str] = None,
+                         fields: Optional[List[str]] = None,
+                         response_format: Optional[str] = None) -> Dict:
+    """Gets one page of cases, ordered by case ID.
+    
+    Args:
+        limit: Maximum number of cases to return (1-500).
+        cursor: The next_cursor from a previous page; omit for the first page.
+        fields: Case fields to return, e.g. ["title", "status", "client_name"].
+            Omit for the full case. The id is always included. Valid fields:
+            id, title, description, status, case_details, client_id, lawyer_id,
+            created_at, client_name, client_contact, lawyer_name, lawyer_specialization.
+        response_format: "rows" for a list of objects, or "compact" for
+            {"columns", "rows", "dictionaries"} with repeated names sent once
+            and referenced by index. Defaults to the server setting.
+        
+    Returns:
+        Dict: "cases" on this page and "next_cursor" (None on the last page).
+        
+    Raises:
+        ValueError: If limit is out of range, the cursor is invalid or an
+            unknown field or response_format is requested.
+    """
+    async with AsyncSessionLocal() as db:
+        cases, next_cursor = await keyset_page(
+            db, case_select(fields), models.Case.id, limit, cursor
+        )
+        return {
+            "cases": format_rows(cases, response_format),
+            "next_cursor": next_cursor
+        }
 
 @mcp.tool()
-def get_case_by_id(case_id: int) -> Dict:
+@tool_metrics.instrument
+@traced_tool
+async def get_case_by_id(case_id: int, fields: Optional[List[str]] = None) -> Dict:
     """Gets a specific case by its ID.
     
     Args:
         case_id: The ID of the case to retrieve.
+        fields: Case fields to return, e.g. ["title", "status", "client_name"].
+            Omit for the full case. The id is always included. Valid fields:
+            id, title, description, status, case_details, client_id, lawyer_id,
+            created_at, client_name, client_contact, lawyer_name, lawyer_specialization.
         
     Returns:
         Dict: Case information with client and lawyer details.
         
     Raises:
-        ValueError: If case with given ID is not found.
+        ValueError: If case with given ID is not found or an unknown field is requested.
     """
-    db = get_db()
-    try:
-        case = db.query(models.Case).filter(models.Case.id == case_id).first()
-        if not case:
+    if fields is None:
+        cached = entity_cache.get("case", case_id)
+        if cached is not None:
+            return cached
+
+    async with AsyncSessionLocal() as db:
+        case_data = first_dict(
+            await db.execute(case_select(fields).where(models.Case.id == case_id))
+        )
+        if not case_data:
             raise ValueError(f"Case with ID {case_id} not found")
             
-        case_data = {
-            "id": case.id,
-            "title": case.title,
-            "description": case.description,
-            "client_id": case.client_id,
-            "lawyer_id": case.lawyer_id,
-            "created_at": str(case.created_at) if hasattr(case, 'created_at') else None
-        }
+        if fields is None:
+            entity_cache.put("case", case_id, case_data)
+        return case_data
+
+@mcp.tool()
+@tool_metrics.instrument
+@traced_tool
+async def get_cases_by_ids(case_ids: List[int], fields: Optional[List[str]] = None) -> Dict:
+    """Gets several cases by their IDs in one call.
+    
+    Args:
+        case_ids: The IDs of the cases to retrieve (at most 500).
+        fields: Case fields to return, e.g. ["title", "status", "client_name"].
+            Omit for the full case. The id is always included. Valid fields:
+            id, title, description, status, case_details, client_id, lawyer_id,
+            created_at, client_name, client_contact, lawyer_name, lawyer_specialization.
         
-        # Add client information if available
-        if case.client:
-            case_data["client_name"] = case.client.name
-            case_data["client_contact"] = case.client.contact
+    Returns:
+        Dict: "found" maps each existing case ID to its case information with
+        client and lawyer details; "missing_ids" lists IDs with no case.
         
-        # Add lawyer information if available
-        if case.lawyer:
-            case_data["lawyer_name"] = case.lawyer.name
-            case_data["lawyer_specialization"] = case.lawyer.specialization
-            
-        return case_data
-    finally:
-        db.close()
+    Raises:
+        ValueError: If more than 500 IDs are passed or an unknown field is requested.
+    """
+    async def fetch(db, ids):
+        cases = rows_to_dicts(
+            await db.execute(case_select(fields).where(models.Case.id.in_(ids)))
+        )
+        return {case["id"]: case for case in cases}
+
+    return await batch_lookup("case", case_ids, fetch, use_cache=fields is None)
 
 @mcp.tool()
-def add_case(title: str, description: str, client_id: int, lawyer_id: int) -> Dict:
+@tool_metrics.instrument
+@traced_tool
+async def add_case(title: str, description: str, client_id: int, lawyer_id: int) -> Dict:
     """Adds a new case to the legal database.
     
     Args:
@@ -113,64 +481,180 @@ def add_case(title: str, description: str, client_id: int, lawyer_id: int) -> Di
     Raises:
         ValueError: If client or lawyer with given IDs don't exist.
     """
-    db = get_db()
+    # One SELECT on the read pool (skipped when both are cached), then one
+    # INSERT ... RETURNING, group-committed by the writer; the response is
+    # built from the values we already have.
+    client = entity_cache.get("client", client_id)
+    lawyer = entity_cache.get("lawyer", lawyer_id)
+    async with AsyncSessionLocal() as db:
+        if client is None or lawyer is None:
+            # Verify client and lawyer exist in one query and cache them
+            rows = (await db.execute(
+                select(literal("client"), models.Client.id, models.Client.name, models.Client.contact)
+                .where(models.Client.id == client_id)
+                .union_all(
+                    select(literal("lawyer"), models.Lawyer.id, models.Lawyer.name, models.Lawyer.specialization)
+                    .where(models.Lawyer.id == lawyer_id)
+                )
+            )).all()
+            found = {kind: (entity_id, name, extra) for kind, entity_id, name, extra in rows}
+            if "client" not in found:
+                raise ValueError(f"Client with ID {client_id} not found")
+            if "lawyer" not in found:
+                raise ValueError(f"Lawyer with ID {lawyer_id} not found")
+            client = dict(zip(("id", "name", "contact"), found["client"]))
+            lawyer = dict(zip(("id", "name", "specialization"), found["lawyer"]))
+            entity_cache.put("client", client_id, client)
+            entity_cache.put("lawyer", lawyer_id, lawyer)
+
+    values = {
+        "title": title,
+        "description": description,
+        "status": "Open",
+        "client_id": client_id,
+        "lawyer_id": lawyer_id,
+        "date_created": datetime.utcnow()
+    }
     try:
-        # Verify client exists
-        client = db.query(models.Client).filter(models.Client.id == client_id).first()
-        if not client:
-            raise ValueError(f"Client with ID {client_id} not found")
-            
-        # Verify lawyer exists
-        lawyer = db.query(models.Lawyer).filter(models.Lawyer.id == lawyer_id).first()
-        if not lawyer:
-            raise ValueError(f"Lawyer with ID {lawyer_id} not found")
+        # The foreign keys still guard the insert if a cached row has gone
+        case_id = await write_queue.run(lambda conn: conn.execute(
+            insert(models.Case).values(**values).returning(models.Case.id)
+        ).scalar())
+    except IntegrityError:
+        raise ValueError(f"Client {client_id} or lawyer {lawyer_id} not found")
+    entity_cache.invalidate("case", case_id)
+    similarity_index.sync_in_background()
+    
+    return {
+        "id": case_id,
+        "title": title,
+        "description": description,
+        "client_id": client_id,
+        "lawyer_id": lawyer_id,
+        "client_name": client["name"],
+        "lawyer_name": lawyer["name"],
+        "message": "Case added successfully"
+    }
+
+@mcp.tool()
+@tool_metrics.instrument
+@traced_tool
+async def add_cases_bulk(cases: List[Dict]) -> Dict:
+    """Adds many cases to the legal database in one transaction.
+    
+    Args:
+        cases: Cases to add, each with title, description, client_id and lawyer_id.
         
-        case = models.Case(
-            title=title,
-            description=description,
-            client_id=client_id,
-            lawyer_id=lawyer_id
-        )
-        db.add(case)
-        db.commit()
-        db.refresh(case)
+    Returns:
+        Dict: "created" with the index and new ID of each added case, and
+        "errors" with the index and reason for each rejected one.
         
-        return {
-            "id": case.id,
-            "title": case.title,
-            "description": case.description,
-            "client_id": case.client_id,
-            "lawyer_id": case.lawyer_id,
-            "client_name": client.name,
-            "lawyer_name": lawyer.name,
-            "message": "Case added successfully"
-        }
-    finally:
-        db.close()
+    Raises:
+        ValueError: If more than 5000 cases are passed.
+    """
+    valid, errors = validate_bulk_rows(
+        cases, {"title": str, "description": str, "client_id": int, "lawyer_id": int}
+    )
+    async with AsyncSessionLocal() as db:
+        # Look up every referenced client and lawyer in one statement
+        client_ids = {row["client_id"] for _, row in valid}
+        lawyer_ids = {row["lawyer_id"] for _, row in valid}
+        existing = await db.execute(
+            select(literal("client"), models.Client.id)
+            .where(models.Client.id.in_(client_ids))
+            .union_all(
+                select(literal("lawyer"), models.Lawyer.id)
+                .where(models.Lawyer.id.in_(lawyer_ids))
+            )
+        )
+        found = set(existing.all())
+
+        insertable = []
+        for index, row in valid:
+            if ("client", row["client_id"]) not in found:
+                errors.append({"index": index, "error": f"Client with ID {row['client_id']} not found"})
+            elif ("lawyer", row["lawyer_id"]) not in found:
+                errors.append({"index": index, "error": f"Lawyer with ID {row['lawyer_id']} not found"})
+            else:
+                insertable.append((index, row))
+
+    created = await write_queue.run(lambda conn: bulk_insert(conn, models.Case, insertable))
+    similarity_index.sync_in_background()
+
+    return {
+        "created": created,
+        "errors": sorted(errors, key=lambda error: error["index"]),
+        "message": f"{len(created)} cases added, {len(errors)} rejected"
+    }
 
 @mcp.tool()
-def get_all_clients() -> List[Dict]:
+@tool_metrics.instrument
+@traced_tool
+async def get_all_clients(response_format: Optional[str] = None,
+                          max_tokens: Optional[int] = None, max_bytes: Optional[int] = None,
+                          continuation: Optional[str] = None) -> Union[List[Dict], Dict]:
     """Gets all clients from the legal database.
     
+    Args:
+        response_format: "rows" for a list of objects, or "compact" for
+            {"columns", "rows", "dictionaries"} with repeated names sent once
+            and referenced by index. Defaults to the server setting.
+        max_tokens: Stop adding clients once the response would exceed about this
+            many LLM tokens; the rest can be fetched with the continuation.
+        max_bytes: Same as max_tokens, as a limit on response bytes.
+        continuation: The continuation from a truncated response, to resume it.
+        
     Returns:
         List[Dict]: List of all clients with their information.
+        With max_tokens, max_bytes or continuation, a Dict with "clients" plus
+        "truncated", "continuation", "returned", "omitted" and "total_count".
+        
+    Raises:
+        ValueError: If response_format is unknown, a budget is not positive
+            or the continuation is invalid.
     """
-    db = get_db()
-    try:
-        clients = db.query(models.Client).all()
-        return [
-            {
-                "id": client.id,
-                "name": client.name,
-                "contact": client.contact
-            }
-            for client in clients
-        ]
-    finally:
-        db.close()
+    async with AsyncSessionLocal() as db:
+        clients, summary = await budgeted_rows(
+            db, client_select(), models.Client.id, max_tokens, max_bytes, continuation
+        )
+    if summary is None:
+        return format_rows(clients, response_format)
+    return {"clients": format_rows(clients, response_format), **summary}
+
+@mcp.tool()
+@tool_metrics.instrument
+@traced_tool
+async def get_clients_page(limit: int = DEFAULT_PAGE_SIZE, cursor: Optional[str] = None,
+                           response_format: Optional[str] = None) -> Dict:
+    """Gets one page of clients, ordered by client ID.
+    
+    Args:
+        limit: Maximum number of clients to return (1-500).
+        cursor: The next_cursor from a previous page; omit for the first page.
+        response_format: "rows" for a list of objects, or "compact" for
+            {"columns", "rows", "dictionaries"} with repeated names sent once
+            and referenced by index. Defaults to the server setting.
+        
+    Returns:
+        Dict: "clients" on this page and "next_cursor" (None on the last page).
+        
+    Raises:
+        ValueError: If limit is out of range, the cursor is invalid or
+            response_format is unknown.
+    """
+    async with AsyncSessionLocal() as db:
+        clients, next_cursor = await keyset_page(
+            db, client_select(), models.Client.id, limit, cursor
+        )
+        return {
+            "clients": format_rows(clients, response_format),
+            "next_cursor": next_cursor
+        }
 
 @mcp.tool()
-def get_client_by_id(client_id: int) -> Dict:
+@tool_metrics.instrument
+@traced_tool
+async def get_client_by_id(client_id: int) -> Dict:
     """Gets a specific client by their ID.
     
     Args:
@@ -182,22 +666,70 @@ def get_client_by_id(client_id: int) -> Dict:
     Raises:
         ValueError: If client with given ID is not found.
     """
-    db = get_db()
-    try:
-        client = db.query(models.Client).filter(models.Client.id == client_id).first()
-        if not client:
+    cached = entity_cache.get("client", client_id)
+    if cached is not None:
+        return cached
+
+    async with AsyncSessionLocal() as db:
+        client_data = first_dict(
+            await db.execute(client_select().where(models.Client.id == client_id))
+        )
+        if not client_data:
             raise ValueError(f"Client with ID {client_id} not found")
             
-        return {
-            "id": client.id,
-            "name": client.name,
-            "contact": client.contact
-        }
-    finally:
-        db.close()
+        entity_cache.put("client", client_id, client_data)
+        return client_data
+
+@mcp.tool()
+@tool_metrics.instrument
+@traced_tool
+async def get_clients_by_ids(client_ids: List[int]) -> Dict:
+    """Gets several clients by their IDs in one call.
+    
+    Args:
+        client_ids: The IDs of the clients to retrieve (at most 500).
+        
+    Returns:
+        Dict: "found" maps each existing client ID to its information;
+        "missing_ids" lists IDs with no client.
+        
+    Raises:
+        ValueError: If more than 500 IDs are passed.
+    """
+    async def fetch(db, ids):
+        clients = rows_to_dicts(
+            await db.execute(client_select().where(models.Client.id.in_(ids)))
+        )
+        return {client["id"]: client for client in clients}
+
+    return await batch_lookup("client", client_ids, fetch)
 
 @mcp.tool()
-def add_client(name: str, contact: str) -> Dict:
+@tool_metrics.instrument
+@traced_tool
+async def find_clients_by_name(name: str, limit: int = 10) -> List[Dict]:
+    """Finds clients by name, tolerating typos and partial names.
+    
+    Use this to resolve a name mentioned in conversation to client IDs
+    instead of listing every client.
+    
+    Args:
+        name: The full or partial name to look up, e.g. "john doe" or "Jhon".
+        limit: Maximum number of clients to return (1-500).
+        
+    Returns:
+        List[Dict]: The closest matches, best first, each with its id, name
+        and a similarity score between 0 and 1 (1 is an exact match).
+        
+    Raises:
+        ValueError: If name is shorter than 3 characters or limit is out of range.
+    """
+    return await find_by_name("client", models.Client, name, limit)
+
+@mcp.tool()
+@tool_metrics.instrument
+@traced_tool
+async def add_client(name: str, contact: str) -> Dict:
     """Adds a new client to the legal database.
     
     Args:
@@ -207,45 +739,111 @@ def add_client(name: str, contact: str) -> Dict:
     Returns:
         Dict: The created client information.
     """
-    db = get_db()
-    try:
-        client = models.Client(name=name, contact=contact)
-        db.add(client)
-        db.commit()
-        db.refresh(client)
+    client_id = await write_queue.run(lambda conn: conn.execute(
+        insert(models.Client).values(name=name, contact=contact).returning(models.Client.id)
+    ).scalar())
+    
+    client_data = {
+        "id": client_id,
+        "name": name,
+        "contact": contact
+    }
+    entity_cache.put("client", client_id, client_data)
+    return {**client_data, "message": "Client added successfully"}
+
+@mcp.tool()
+@tool_metrics.instrument
+@traced_tool
+async def add_clients_bulk(clients: List[Dict]) -> Dict:
+    """Adds many clients to the legal database in one transaction.
+    
+    Args:
+        clients: Clients to add, each with name and contact.
         
-        return {
-            "id": client.id,
-            "name": client.name,
-            "contact": client.contact,
-            "message": "Client added successfully"
-        }
-    finally:
-        db.close()
+    Returns:
+        Dict: "created" with the index and new ID of each added client, and
+        "errors" with the index and reason for each rejected one.
+        
+    Raises:
+        ValueError: If more than 5000 clients are passed.
+    """
+    valid, errors = validate_bulk_rows(clients, {"name": str, "contact": str})
+    created = await write_queue.run(lambda conn: bulk_insert(conn, models.Client, valid))
+
+    return {
+        "created": created,
+        "errors": errors,
+        "message": f"{len(created)} clients added, {len(errors)} rejected"
+    }
 
 @mcp.tool()
-def get_all_lawyers() -> List[Dict]:
+@tool_metrics.instrument
+@traced_tool
+async def get_all_lawyers(response_format: Optional[str] = None,
+                          max_tokens: Optional[int] = None, max_bytes: Optional[int] = None,
+                          continuation: Optional[str] = None) -> Union[List[Dict], Dict]:
     """Gets all lawyers from the legal database.
     
+    Args:
+        response_format: "rows" for a list of objects, or "compact" for
+            {"columns", "rows", "dictionaries"} with repeated names sent once
+            and referenced by index. Defaults to the server setting.
+        max_tokens: Stop adding lawyers once the response would exceed about this
+            many LLM tokens; the rest can be fetched with the continuation.
+        max_bytes: Same as max_tokens, as a limit on response bytes.
+        continuation: The continuation from a truncated response, to resume it.
+        
     Returns:
         List[Dict]: List of all lawyers with their information.
+        With max_tokens, max_bytes or continuation, a Dict with "lawyers" plus
+        "truncated", "continuation", "returned", "omitted" and "total_count".
+        
+    Raises:
+        ValueError: If response_format is unknown, a budget is not positive
+            or the continuation is invalid.
     """
-    db = get_db()
-    try:
-        lawyers = db.query(models.Lawyer).all()
-        return [
-            {
-                "id": lawyer.id,
-                "name": lawyer.name,
-                "specialization": lawyer.specialization
-            }
-            for lawyer in lawyers
-        ]
-    finally:
-        db.close()
+    async with AsyncSessionLocal() as db:
+        lawyers, summary = await budgeted_rows(
+            db, lawyer_select(), models.Lawyer.id, max_tokens, max_bytes, continuation
+        )
+    if summary is None:
+        return format_rows(lawyers, response_format)
+    return {"lawyers": format_rows(lawyers, response_format), **summary}
+
+@mcp.tool()
+@tool_metrics.instrument
+@traced_tool
+async def get_lawyers_page(limit: int = DEFAULT_PAGE_SIZE, cursor: Optional[str] = None,
+                           response_format: Optional[str] = None) -> Dict:
+    """Gets one page of lawyers, ordered by lawyer ID.
+    
+    Args:
+        limit: Maximum number of lawyers to return (1-500).
+        cursor: The next_cursor from a previous page; omit for the first page.
+        response_format: "rows" for a list of objects, or "compact" for
+            {"columns", "rows", "dictionaries"} with repeated names sent once
+            and referenced by index. Defaults to the server setting.
+        
+    Returns:
+        Dict: "lawyers" on this page and "next_cursor" (None on the last page).
+        
+    Raises:
+        ValueError: If limit is out of range, the cursor is invalid or
+            response_format is unknown.
+    """
+    async with AsyncSessionLocal() as db:
+        lawyers, next_cursor = await keyset_page(
+            db, lawyer_select(), models.Lawyer.id, limit, cursor
+        )
+        return {
+            "lawyers": format_rows(lawyers, response_format),
+            "next_cursor": next_cursor
+        }
 
 @mcp.tool()
-def get_lawyer_by_id(lawyer_id: int) -> Dict:
+@tool_metrics.instrument
+@traced_tool
+async def get_lawyer_by_id(lawyer_id: int) -> Dict:
     """Gets a specific lawyer by their ID.
     
     Args:
@@ -257,22 +855,70 @@ def get_lawyer_by_id(lawyer_id: int) -> Dict:
     Raises:
         ValueError: If lawyer with given ID is not found.
     """
-    db = get_db()
-    try:
-        lawyer = db.query(models.Lawyer).filter(models.Lawyer.id == lawyer_id).first()
-        if not lawyer:
+    cached = entity_cache.get("lawyer", lawyer_id)
+    if cached is not None:
+        return cached
+
+    async with AsyncSessionLocal() as db:
+        lawyer_data = first_dict(
+            await db.execute(lawyer_select().where(models.Lawyer.id == lawyer_id))
+        )
+        if not lawyer_data:
             raise ValueError(f"Lawyer with ID {lawyer_id} not found")
             
-        return {
-            "id": lawyer.id,
-            "name": lawyer.name,
-            "specialization": lawyer.specialization
-        }
-    finally:
-        db.close()
+        entity_cache.put("lawyer", lawyer_id, lawyer_data)
+        return lawyer_data
+
+@mcp.tool()
+@tool_metrics.instrument
+@traced_tool
+async def get_lawyers_by_ids(lawyer_ids: List[int]) -> Dict:
+    """Gets several lawyers by their IDs in one call.
+    
+    Args:
+        lawyer_ids: The IDs of the lawyers to retrieve (at most 500).
+        
+    Returns:
+        Dict: "found" maps each existing lawyer ID to its information;
+        "missing_ids" lists IDs with no lawyer.
+        
+    Raises:
+        ValueError: If more than 500 IDs are passed.
+    """
+    async def fetch(db, ids):
+        lawyers = rows_to_dicts(
+            await db.execute(lawyer_select().where(models.Lawyer.id.in_(ids)))
+        )
+        return {lawyer["id"]: lawyer for lawyer in lawyers}
+
+    return await batch_lookup("lawyer", lawyer_ids, fetch)
 
 @mcp.tool()
-def add_lawyer(name: str, specialization: str) -> Dict:
+@tool_metrics.instrument
+@traced_tool
+async def find_lawyers_by_name(name: str, limit: int = 10) -> List[Dict]:
+    """Finds lawyers by name, tolerating typos and partial names.
+    
+    Use this to resolve a name mentioned in conversation to lawyer IDs
+    instead of listing every lawyer.
+    
+    Args:
+        name: The full or partial name to look up, e.g. "Meera Iyer" or "Iyr".
+        limit: Maximum number of lawyers to return (1-500).
+        
+    Returns:
+        List[Dict]: The closest matches, best first, each with its id, name
+        and a similarity score between 0 and 1 (1 is an exact match).
+        
+    Raises:
+        ValueError: If name is shorter than 3 characters or limit is out of range.
+    """
+    return await find_by_name("lawyer", models.Lawyer, name, limit)
+
+@mcp.tool()
+@tool_metrics.instrument
+@traced_tool
+async def add_lawyer(name: str, specialization: str) -> Dict:
     """Adds a new lawyer to the legal database.
     
     Args:
@@ -282,147 +928,553 @@ def add_lawyer(name: str, specialization: str) -> Dict:
     Returns:
         Dict: The created lawyer information.
     """
-    db = get_db()
-    try:
-        lawyer = models.Lawyer(name=name, specialization=specialization)
-        db.add(lawyer)
-        db.commit()
-        db.refresh(lawyer)
+    lawyer_id = await write_queue.run(lambda conn: conn.execute(
+        insert(models.Lawyer).values(name=name, specialization=specialization).returning(models.Lawyer.id)
+    ).scalar())
+    
+    lawyer_data = {
+        "id": lawyer_id,
+        "name": name,
+        "specialization": specialization
+    }
+    entity_cache.put("lawyer", lawyer_id, lawyer_data)
+    return {**lawyer_data, "message": "Lawyer added successfully"}
+
+@mcp.tool()
+@tool_metrics.instrument
+@traced_tool
+async def add_lawyers_bulk(lawyers: List[Dict]) -> Dict:
+    """Adds many lawyers to the legal database in one transaction.
+    
+    Args:
+        lawyers: Lawyers to add, each with name and specialization.
         
-        return {
-            "id": lawyer.id,
-            "name": lawyer.name,
-            "specialization": lawyer.specialization,
-            "message": "Lawyer added successfully"
-        }
-    finally:
-        db.close()
+    Returns:
+        Dict: "created" with the index and new ID of each added lawyer, and
+        "errors" with the index and reason for each rejected one.
+        
+    Raises:
+        ValueError: If more than 5000 lawyers are passed.
+    """
+    valid, errors = validate_bulk_rows(lawyers, {"name": str, "specialization": str})
+    created = await write_queue.run(lambda conn: bulk_insert(conn, models.Lawyer, valid))
+
+    return {
+        "created": created,
+        "errors": errors,
+        "message": f"{len(created)} lawyers added, {len(errors)} rejected"
+    }
 
 @mcp.tool()
-def get_cases_by_client(client_id: int) -> List[Dict]:
+@tool_metrics.instrument
+@traced_tool
+async def get_cases_by_client(client_id: int, fields: Optional[List[str]] = None,
+                             response_format: Optional[str] = None,
+                             max_tokens: Optional[int] = None, max_bytes: Optional[int] = None,
+                             continuation: Optional[str] = None) -> Union[List[Dict], Dict]:
     """Gets all cases associated with a specific client.
     
     Args:
         client_id: The ID of the client.
+        fields: Case fields to return, e.g. ["title", "status", "client_name"].
+            Omit for the full case. The id is always included. Valid fields:
+            id, title, description, status, case_details, client_id, lawyer_id,
+            created_at, client_name, client_contact, lawyer_name, lawyer_specialization.
+        response_format: "rows" for a list of objects, or "compact" for
+            {"columns", "rows", "dictionaries"} with repeated names sent once
+            and referenced by index. Defaults to the server setting.
+        max_tokens: Stop adding cases once the response would exceed about this
+            many LLM tokens; the rest can be fetched with the continuation.
+        max_bytes: Same as max_tokens, as a limit on response bytes.
+        continuation: The continuation from a truncated response, to resume it.
         
     Returns:
         List[Dict]: List of cases for the specified client.
+        With max_tokens, max_bytes or continuation, a Dict with "cases" plus
+        "truncated", "continuation", "returned", "omitted" and "total_count".
         
     Raises:
-        ValueError: If client with given ID is not found.
+        ValueError: If client with given ID is not found or an unknown field or
+            response_format is requested, a budget is not positive or the
+            continuation is invalid.
     """
-    db = get_db()
-    try:
+    async with AsyncSessionLocal() as db:
         # Verify client exists
-        client = db.query(models.Client).filter(models.Client.id == client_id).first()
+        client = (
+            await db.execute(select(models.Client.id).where(models.Client.id == client_id))
+        ).first()
         if not client:
             raise ValueError(f"Client with ID {client_id} not found")
             
-        cases = db.query(models.Case).filter(models.Case.client_id == client_id).all()
-        result = []
-        for case in cases:
-            case_data = {
-                "id": case.id,
-                "title": case.title,
-                "description": case.description,
-                "client_id": case.client_id,
-                "lawyer_id": case.lawyer_id,
-                "client_name": client.name
-            }
-            
-            # Add lawyer information if available
-            if case.lawyer:
-                case_data["lawyer_name"] = case.lawyer.name
-                case_data["lawyer_specialization"] = case.lawyer.specialization
-                
-            result.append(case_data)
-        return result
-    finally:
-        db.close()
+        statement = case_select(fields).where(models.Case.client_id == client_id)
+        cases, summary = await budgeted_rows(
+            db, statement, models.Case.id, max_tokens, max_bytes, continuation
+        )
+    if summary is None:
+        return format_rows(cases, response_format)
+    return {"cases": format_rows(cases, response_format), **summary}
 
 @mcp.tool()
-def get_cases_by_lawyer(lawyer_id: int) -> List[Dict]:
+@tool_metrics.instrument
+@traced_tool
+async def get_cases_by_lawyer(lawyer_id: int, fields: Optional[List[str]] = None,
+                             response_format: Optional[str] = None,
+                             max_tokens: Optional[int] = None, max_bytes: Optional[int] = None,
+                             continuation: Optional[str] = None) -> Union[List[Dict], Dict]:
     """Gets all cases assigned to a specific lawyer.
     
     Args:
         lawyer_id: The ID of the lawyer.
+        fields: Case fields to return, e.g. ["title", "status", "client_name"].
+            Omit for the full case. The id is always included. Valid fields:
+            id, title, description, status, case_details, client_id, lawyer_id,
+            created_at, client_name, client_contact, lawyer_name, lawyer_specialization.
+        response_format: "rows" for a list of objects, or "compact" for
+            {"columns", "rows", "dictionaries"} with repeated names sent once
+            and referenced by index. Defaults to the server setting.
+        max_tokens: Stop adding cases once the response would exceed about this
+            many LLM tokens; the rest can be fetched with the continuation.
+        max_bytes: Same as max_tokens, as a limit on response bytes.
+        continuation: The continuation from a truncated response, to resume it.
         
     Returns:
         List[Dict]: List of cases for the specified lawyer.
+        With max_tokens, max_bytes or continuation, a Dict with "cases" plus
+        "truncated", "continuation", "returned", "omitted" and "total_count".
         
     Raises:
-        ValueError: If lawyer with given ID is not found.
+        ValueError: If lawyer with given ID is not found or an unknown field or
+            response_format is requested, a budget is not positive or the
+            continuation is invalid.
     """
-    db = get_db()
-    try:
+    async with AsyncSessionLocal() as db:
         # Verify lawyer exists
-        lawyer = db.query(models.Lawyer).filter(models.Lawyer.id == lawyer_id).first()
+        lawyer = (
+            await db.execute(select(models.Lawyer.id).where(models.Lawyer.id == lawyer_id))
+        ).first()
         if not lawyer:
             raise ValueError(f"Lawyer with ID {lawyer_id} not found")
             
-        cases = db.query(models.Case).filter(models.Case.lawyer_id == lawyer_id).all()
-        result = []
-        for case in cases:
-            case_data = {
-                "id": case.id,
-                "title": case.title,
-                "description": case.description,
-                "client_id": case.client_id,
-                "lawyer_id": case.lawyer_id,
-                "lawyer_name": lawyer.name
-            }
-            
-            # Add client information if available
-            if case.client:
-                case_data["client_name"] = case.client.name
-                case_data["client_contact"] = case.client.contact
-                
-            result.append(case_data)
-        return result
-    finally:
-        db.close()
+        statement = case_select(fields).where(models.Case.lawyer_id == lawyer_id)
+        cases, summary = await budgeted_rows(
+            db, statement, models.Case.id, max_tokens, max_bytes, continuation
+        )
+    if summary is None:
+        return format_rows(cases, response_format)
+    return {"cases": format_rows(cases, response_format), **summary}
 
 @mcp.tool()
-def search_cases(query: str) -> List[Dict]:
-    """Searches for cases by title or description.
+@tool_metrics.instrument
+@traced_tool
+async def search_cases(query: str, limit: int = DEFAULT_SEARCH_LIMIT,
+                       fields: Optional[List[str]] = None,
+                       response_format: Optional[str] = None) -> Union[List[Dict], Dict]:
+    """Searches for cases by title, description or case details.
+    
+    Uses the full-text index, so results are ranked by relevance (BM25) and
+    each one carries a snippet with the matched words in [brackets].
     
     Args:
-        query: The search query to match against case titles and descriptions.
+        query: The search query to match against case titles, descriptions and details.
+        limit: Maximum number of cases to return (1-500).
+        fields: Case fields to return, e.g. ["title", "status", "client_name"].
+            Omit for the full case. The id is always included. Valid fields:
+            id, title, description, status, case_details, client_id, lawyer_id,
+            created_at, client_name, client_contact, lawyer_name, lawyer_specialization.
+        response_format: "rows" for a list of objects, or "compact" for
+            {"columns", "rows", "dictionaries"} with repeated names sent once
+            and referenced by index. Defaults to the server setting.
         
     Returns:
-        List[Dict]: List of cases matching the search query.
+        List[Dict]: List of matching cases, best match first.
+        
+    Raises:
+        ValueError: If limit is out of range or an unknown field or response_format
+            is requested.
     """
-    db = get_db()
-    try:
-        cases = db.query(models.Case).filter(
-            (models.Case.title.contains(query)) | 
-            (models.Case.description.contains(query))
-        ).all()
-        
-        result = []
-        for case in cases:
-            case_data = {
-                "id": case.id,
-                "title": case.title,
-                "description": case.description,
-                "client_id": case.client_id,
-                "lawyer_id": case.lawyer_id
-            }
-            
-            # Add client information if available
-            if case.client:
-                case_data["client_name"] = case.client.name
-                case_data["client_contact"] = case.client.contact
-            
-            # Add lawyer information if available
-            if case.lawyer:
-                case_data["lawyer_name"] = case.lawyer.name
-                case_data["lawyer_specialization"] = case.lawyer.specialization
-                
-            result.append(case_data)
-        return result
-    finally:
-        db.close()
+    if limit < 1 or limit > MAX_PAGE_SIZE:
+        raise ValueError(f"limit must be between 1 and {MAX_PAGE_SIZE}")
+    match = to_match_query(query)
+    if not match:
+        return format_rows([], response_format)
+
+    fts = table(FTS_TABLE, column("rowid"))
+    fts_ref = literal_column(FTS_TABLE)
+    # Title hits weigh more than description hits, which weigh more than details
+    rank = func.bm25(fts_ref, 10.0, 5.0, 1.0).label("rank")
+    snippet = func.snippet(fts_ref, -1, "[", "]", "…", 12).label("snippet")
+
+    async with AsyncSessionLocal() as db:
+        statement = (
+            case_select(fields)
+            .add_columns(rank, snippet)
+            .join(fts, fts.c.rowid == models.Case.id)
+            .where(fts_ref.op("MATCH")(match))
+            .order_by(rank)
+            .limit(limit)
+        )
+        cases = rows_to_dicts(await db.execute(statement))
+    return format_rows(cases, response_format)
+
+@mcp.tool()
+@tool_metrics.instrument
+@traced_tool
+async def find_similar_cases(case_id: Optional[int] = None, text: Optional[str] = None, k: int = 10,
+                             fields: Optional[List[str]] = None,
+                             response_format: Optional[str] = None) -> Union[List[Dict], Dict]:
+    """Finds the cases most similar to a given case or to a piece of text.
+    
+    Compares wording across titles, descriptions and case details (TF-IDF
+    cosine similarity), so it finds precedent-like cases that share terms
+    without needing an exact phrase. Pass exactly one of case_id or text.
+    
+    Args:
+        case_id: Find cases similar to this case (it is left out of the results).
+        text: Find cases similar to this description.
+        k: Number of cases to return (1-500).
+        fields: Case fields to return, e.g. ["title", "status", "client_name"].
+            Omit for the full case. The id is always included.
+        response_format: "rows" for a list of objects, or "compact" for
+            {"columns", "rows", "dictionaries"} with repeated names sent once
+            and referenced by index. Defaults to the server setting.
+        
+    Returns:
+        List[Dict]: The most similar cases, best first, each with a "similarity" score (0-1).
+        
+    Raises:
+        ValueError: If neither or both of case_id and text are given, the case
+            doesn't exist, k is out of range or an unknown field or
+            response_format is requested.
+    """
+    if (case_id is None) == (text is None):
+        raise ValueError("Pass exactly one of case_id or text")
+    if k < 1 or k > MAX_PAGE_SIZE:
+        raise ValueError(f"k must be between 1 and {MAX_PAGE_SIZE}")
+    case_select(fields)  # validate fields before searching
+
+    if case_id is not None:
+        async with AsyncSessionLocal() as db:
+            row = (await db.execute(
+                select(models.Case.title, models.Case.description, models.Case.case_details)
+                .where(models.Case.id == case_id)
+            )).first()
+        if row is None:
+            raise ValueError(f"Case with ID {case_id} not found")
+        text = case_text(*row)
+
+    matches = await asyncio.to_thread(similarity_index.find, text, k, case_id)
+    if not matches:
+        return format_rows([], response_format)
+    async with AsyncSessionLocal() as db:
+        found = rows_to_dicts(await db.execute(
+            case_select(fields).where(models.Case.id.in_([match_id for match_id, _ in matches]))
+        ))
+    by_id = {case["id"]: case for case in found}
+    cases = [
+        {**by_id[match_id], "similarity": round(score, 4)}
+        for match_id, score in matches if match_id in by_id
+    ]
+    return format_rows(cases, response_format)
+
+@mcp.tool()
+@tool_metrics.instrument
+@traced_tool
+async def count_cases(
+    group_by: str = "lawyer",
+    split_by_status: bool = False,
+    top_n: Optional[int] = None,
+    status: Optional[str] = None,
+    client_id: Optional[int] = None,
+    lawyer_id: Optional[int] = None,
+    specialization: Optional[str] = None,
+    created_after: Optional[str] = None,
+    created_before: Optional[str] = None,
+) -> Dict:
+    """Counts cases grouped by lawyer, specialization, status, client or month.
+    
+    Use this for workload and case-mix questions (e.g. "which lawyers have
+    the most cases", "case outcomes by specialization") instead of fetching
+    every case. The counting happens in the database.
+    
+    Args:
+        group_by: One of "lawyer", "specialization", "status", "client" or "month".
+        split_by_status: Also break every group down by case status.
+        top_n: Only return the N largest groups. With split_by_status, every
+            status row of those N groups is returned.
+        status: Only count cases with this status.
+        client_id: Only count cases of this client.
+        lawyer_id: Only count cases of this lawyer.
+        specialization: Only count cases whose lawyer has this specialization.
+        created_after: Only count cases created on or after this ISO date.
+        created_before: Only count cases created before this ISO date.
+        
+    Returns:
+        Dict: A table with "columns" and "rows" (largest groups first; by
+        month in date order), plus "total_cases" across all groups.
+        
+    Raises:
+        ValueError: If group_by, top_n or a date is invalid.
+    """
+    if group_by not in CASE_GROUPINGS:
+        raise ValueError(f"group_by must be one of: {', '.join(CASE_GROUPINGS)}")
+    if top_n is not None and top_n < 1:
+        raise ValueError("top_n must be at least 1")
+
+    group_keys = CASE_GROUPINGS[group_by]
+    keys = list(group_keys)
+    if split_by_status and group_by != "status":
+        keys.append(models.Case.status.label("status"))
+    case_count = func.count(models.Case.id).label("cases")
+
+    conditions = date_conditions(created_after, created_before)
+    if status is not None:
+        conditions.append(models.Case.status == status)
+    if client_id is not None:
+        conditions.append(models.Case.client_id == client_id)
+    if lawyer_id is not None:
+        conditions.append(models.Case.lawyer_id == lawyer_id)
+    if specialization is not None:
+        conditions.append(models.Lawyer.specialization == specialization)
+
+    def grouped(columns):
+        statement = (
+            select(*columns, case_count)
+            .select_from(models.Case)
+            .outerjoin(models.Lawyer, models.Lawyer.id == models.Case.lawyer_id)
+            .where(*conditions)
+            .group_by(*columns)
+        )
+        if group_by == "client":
+            statement = statement.outerjoin(models.Client, models.Client.id == models.Case.client_id)
+        return statement
+
+    statement = grouped(keys)
+    if top_n is not None and len(keys) > len(group_keys):
+        # top_n counts groups, not (group, status) rows: pick the largest
+        # groups first, then break down just those by status
+        top_groups = grouped(group_keys).order_by(case_count.desc(), *group_keys).limit(top_n).subquery()
+        group_id = group_keys[0]
+        statement = statement.join(
+            top_groups, group_id.element.is_not_distinct_from(top_groups.c[group_id.name])
+        ).order_by(top_groups.c.cases.desc(), *group_keys, case_count.desc())
+    elif group_by == "month" and top_n is None:
+        statement = statement.order_by(*keys)
+    else:
+        statement = statement.order_by(case_count.desc(), *keys)
+        if top_n is not None:
+            statement = statement.limit(top_n)
+
+    async with AsyncSessionLocal() as db:
+        rows = (await db.execute(statement)).all()
+        total = (
+            await db.execute(
+                select(func.count(models.Case.id))
+                .select_from(models.Case)
+                .outerjoin(models.Lawyer, models.Lawyer.id == models.Case.lawyer_id)
+                .where(*conditions)
+            )
+        ).scalar()
+
+    return {
+        "group_by": group_by,
+        "columns": [key.name for key in keys] + ["cases"],
+        "rows": [list(row) for row in rows],
+        "total_cases": total
+    }
+
+@mcp.tool()
+@tool_metrics.instrument
+@traced_tool
+async def get_cases_by_date(created_after: Optional[str] = None, created_before: Optional[str] = None,
+                            last_days: Optional[int] = None, limit: int = DEFAULT_PAGE_SIZE,
+                            cursor: Optional[str] = None, fields: Optional[List[str]] = None,
+                            response_format: Optional[str] = None) -> Dict:
+    """Gets cases created in a date range, oldest first, one page at a time.
+    
+    Use this for questions like "what came in last week" instead of listing
+    every case. Dates are UTC.
+    
+    Args:
+        created_after: Only cases created on or after this ISO date/datetime.
+        created_before: Only cases created before this ISO date/datetime.
+        last_days: Only cases created in the last N days, e.g. 7 for last week.
+        limit: Maximum number of cases to return (1-500).
+        cursor: The next_cursor from a previous page; omit for the first page.
+        fields: Case fields to return, e.g. ["title", "status", "client_name"].
+            Omit for the full case. The id and created_at are always included.
+            Valid fields: id, title, description, status, case_details, client_id,
+            lawyer_id, created_at, client_name, client_contact, lawyer_name,
+            lawyer_specialization.
+        response_format: "rows" for a list of objects, or "compact" for
+            {"columns", "rows", "dictionaries"} with repeated names sent once
+            and referenced by index. Defaults to the server setting.
+        
+    Returns:
+        Dict: "cases" on this page and "next_cursor" (None on the last page).
+        
+    Raises:
+        ValueError: If a date, last_days, limit or the cursor is invalid, or an
+            unknown field or response_format is requested.
+    """
+    if limit < 1 or limit > MAX_PAGE_SIZE:
+        raise ValueError(f"limit must be between 1 and {MAX_PAGE_SIZE}")
+    if fields is not None and "created_at" not in fields:
+        fields = [*fields, "created_at"]
+    statement = case_select(fields).where(*date_conditions(created_after, created_before, last_days))
+    position = decode_date_cursor(cursor)
+    if position is not None:
+        # Seek past the last row on the (date_created, id) index order
+        statement = statement.where(
+            tuple_(CASE_FIELDS["created_at"], models.Case.id) > tuple_(literal(position[0]), literal(position[1]))
+        )
+    statement = statement.order_by(models.Case.date_created, models.Case.id).limit(limit + 1)
+
+    async with AsyncSessionLocal() as db:
+        cases = rows_to_dicts(await db.execute(statement))
+    next_cursor = None
+    if len(cases) > limit:
+        cases = cases[:limit]
+        next_cursor = encode_date_cursor(cases[-1]["created_at"], cases[-1]["id"])
+    return {
+        "cases": format_rows(cases, response_format),
+        "next_cursor": next_cursor
+    }
+
+@mcp.tool()
+@tool_metrics.instrument
+@traced_tool
+async def case_histogram(interval: str = "day", created_after: Optional[str] = None,
+                         created_before: Optional[str] = None, last_days: Optional[int] = None,
+                         status: Optional[str] = None) -> Dict:
+    """Counts cases created per day, week or month.
+    
+    Dates are UTC. Periods with no cases are left out.
+    
+    Args:
+        interval: "day", "week" (Monday to Sunday, labelled by the Monday) or "month".
+        created_after: Only count cases created on or after this ISO date/datetime.
+        created_before: Only count cases created before this ISO date/datetime.
+        last_days: Only count cases created in the last N days.
+        status: Only count cases with this status, e.g. "Open".
+        
+    Returns:
+        Dict: A table with "columns" ["period", "cases"] and "rows" in date
+        order, plus "total_cases" across all periods.
+        
+    Raises:
+        ValueError: If interval, last_days or a date is invalid.
+    """
+    if interval not in HISTOGRAM_INTERVALS:
+        raise ValueError(f"interval must be one of: {', '.join(HISTOGRAM_INTERVALS)}")
+    conditions = date_conditions(created_after, created_before, last_days)
+    if status is not None:
+        conditions.append(models.Case.status == status)
+    period = HISTOGRAM_INTERVALS[interval].label("period")
+
+    async with AsyncSessionLocal() as db:
+        rows = (await db.execute(
+            select(period, func.count().label("cases"))
+            .select_from(models.Case)
+            .where(*conditions)
+            .group_by(period)
+            .order_by(period)
+        )).all()
+
+    return {
+        "interval": interval,
+        "columns": ["period", "cases"],
+        "rows": [list(row) for row in rows],
+        "total_cases": sum(count for _, count in rows)
+    }
+
+@mcp.tool()
+@tool_metrics.instrument
+@traced_tool
+async def export_cases(file_name: str, format: str = "jsonl", compression: Optional[str] = None,
+                       fields: Optional[List[str]] = None) -> Dict:
+    """Exports every case with client and lawyer details to a file on the server.
+    
+    Rows are streamed from the database and written as they arrive, so
+    memory stays flat however many cases there are. Use this rather than
+    get_all_cases for full extracts.
+    
+    Args:
+        file_name: Name of the file to write in the server's export directory.
+        format: "jsonl", "csv" or "parquet".
+        compression: Optional "gzip" or "zstd".
+        fields: Case fields to include; defaults to all of them.
+        
+    Returns:
+        Dict: The path written, format, compression, rows, size in bytes and seconds taken.
+        
+    Raises:
+        ValueError: If file_name is not a plain file name, or the format,
+            compression or a field is unknown.
+    """
+    if os.path.basename(file_name) != file_name or file_name in ("", ".", ".."):
+        raise ValueError(f"file_name must be a plain file name, got: {file_name}")
+    os.makedirs(export.EXPORT_DIR, exist_ok=True)
+    return await asyncio.to_thread(
+        export.export_cases, os.path.join(export.EXPORT_DIR, file_name), format, compression, fields
+    )
+
+@mcp.custom_route("/metrics", methods=["GET"])
+async def metrics_endpoint(request: Request) -> Response:
+    """Prometheus scrape endpoint, served next to /sse on the same port."""
+    return PlainTextResponse(tool_metrics.render(), media_type="text/plain; version=0.0.4")
+
+@mcp.resource("stats://writer")
+def writer_stats() -> Dict:
+    """Writes and group-commit batches of the single database writer."""
+    return write_queue.stats()
+
+@mcp.resource("stats://cache")
+def cache_stats() -> Dict:
+    """Hit, miss and eviction counters of the entity lookup cache."""
+    return entity_cache.stats()
+
+def allow_hosts(hosts: str):
+    """Admit more Host headers past FastMCP's DNS-rebinding check.
+
+    Only loopback Host headers are admitted by default, so a server bound
+    to another interface must list the names clients reach it by, e.g.
+    "legal.internal:3000,10.0.0.5:*". "*" turns the check off, which is only
+    safe behind a proxy that validates the Host header itself.
+    """
+    names = [name.strip() for name in hosts.split(",") if name.strip()]
+    if not names:
+        return
+    if "*" in names:
+        mcp.settings.transport_security = TransportSecuritySettings(enable_dns_rebinding_protection=False)
+        return
+    security = mcp.settings.transport_security or TransportSecuritySettings()
+    mcp.settings.transport_security = TransportSecuritySettings(
+        enable_dns_rebinding_protection=True,
+        allowed_hosts=[*security.allowed_hosts, *names],
+        allowed_origins=[
+            *security.allowed_origins,
+            *(f"{scheme}://{name}" for name in names for scheme in ("http", "https")),
+        ],
+    )
+
+def create_http_app():
+    """ASGI app for the stateless streamable-HTTP transport.
+
+    Built by each uvicorn worker process. Stateless mode keeps no session
+    between requests, so any worker can answer any request, and replies are
+    plain JSON instead of an SSE stream held open per client. With
+    LEGAL_METRICS_DIR set, workers share their metrics through it so
+    /metrics reports the whole server.
+    """
+    mcp.settings.stateless_http = True
+    mcp.settings.json_response = True
+    allow_hosts(os.getenv("LEGAL_MCP_ALLOWED_HOSTS", ""))
+    metrics_dir = os.getenv("LEGAL_METRICS_DIR")
+    if metrics_dir:
+        tool_metrics.share(metrics_dir)
+    # Build or catch up the similarity index before the first query needs it
+    similarity_index.sync_in_background(delay=0)
+    return mcp.streamable_http_app()
 
 if __name__ == "__main__":
     # Start the server
@@ -433,15 +1485,55 @@ if __name__ == "__main__":
 
     # Production Mode
     # uv run mcp_legal_server.py --server_type=sse
+    # uv run mcp_legal_server.py --server_type=streamable-http --workers 4
 
     parser = argparse.ArgumentParser()
     parser.add_argument(
-        "--server_type", type=str, default="sse", choices=["sse", "stdio"]
+        "--server_type", type=str, default="sse", choices=["sse", "stdio", "streamable-http"]
+    )
+    parser.add_argument("--host", default=os.getenv("LEGAL_MCP_HOST", "127.0.0.1"))
+    parser.add_argument("--port", type=int, default=int(os.getenv("LEGAL_MCP_PORT", 3000)))
+    parser.add_argument(
+        "--workers", type=int, default=int(os.getenv("LEGAL_MCP_WORKERS", 1)),
+        help="Worker processes sharing the port (streamable-http only)"
+    )
+    parser.add_argument(
+        "--allowed-hosts", default=os.getenv("LEGAL_MCP_ALLOWED_HOSTS", ""),
+        help="Comma-separated Host headers to accept besides loopback, e.g. legal.internal:3000. "
+             "Needed when binding --host to a non-loopback address; '*' disables the "
+             "DNS-rebinding check (only behind a proxy that validates Host)."
     )
     
     args = parser.parse_args()
+    if args.workers != 1 and args.server_type != "streamable-http":
+        parser.error("--workers needs --server_type=streamable-http")
     print("Server type:", args.server_type)
-    print("Launching on Port:", 3000)
-    print('Check "http://localhost:3000/sse" for the server status')
+    print("Launching on Port:", args.port)
     
-    mcp.run(args.server_type)
\ No newline at end of file
+    if args.server_type == "streamable-http":
+        import uvicorn
+
+        import tempfile
+
+        # Workers are separate processes: hand them the settings via the environment
+        os.environ["LEGAL_MCP_ALLOWED_HOSTS"] = args.allowed_hosts
+        metrics_dir = os.getenv("LEGAL_METRICS_DIR") or (
+            os.path.join(tempfile.gettempdir(), f"legal-mcp-metrics-{args.port}") if args.workers > 1 else ""
+        )
+        if metrics_dir:
+            clear_shared(metrics_dir)
+            os.environ["LEGAL_METRICS_DIR"] = metrics_dir
+        print(f'MCP endpoint at "http://{args.host}:{args.port}/mcp" on {args.workers} worker(s)')
+        print(f'Metrics at "http://{args.host}:{args.port}/metrics"')
+        uvicorn.run(
+            "mcp_server:create_http_app", factory=True,
+            host=args.host, port=args.port, workers=args.workers, log_level="warning"
+        )
+    else:
+        mcp.settings.host = args.host
+        mcp.settings.port = args.port
+        allow_hosts(args.allowed_hosts)
+        similarity_index.sync_in_background(delay=0)
+        print(f'Check "http://localhost:{args.port}/sse" for the server status')
+        print(f'Metrics at "http://localhost:{args.port}/metrics"')
+        mcp.run(args.server_type)
\ No newline at end of file
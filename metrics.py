@@ -0,0 +1,214 @@
+import contextvars
+import functools
+import json
+import os
+import threading
+import time
+from bisect import bisect_left
+
+from sqlalchemy import event
+
+from database import current_tool
+from encoding import sample_json_bytes
+
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+ROW_BUCKETS = (0, 1, 10, 50, 100, 500, 1000, 5000, 10000, 50000, 100000)
+BYTE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304, 16777216)
+STATEMENT_BUCKETS = (0, 1, 2, 3, 5, 10, 25, 50, 100)
+
+# Seconds between a worker publishing its metrics to the shared directory
+METRICS_FLUSH_SECONDS = 1.0
+
+# Statement counter of the tool call running in the current task, if any
+current_call_statements = contextvars.ContextVar("current_call_statements", default=None)
+
+class Histogram:
+    """Prometheus-style cumulative histogram, one series per tool name."""
+    def __init__(self, name, help_text, buckets):
+        self.name = name
+        self.help_text = help_text
+        self.buckets = buckets
+        self.series = {}
+
+    def observe(self, tool, value):
+        series = self.series.get(tool)
+        if series is None:
+            series = self.series[tool] = [[0] * (len(self.buckets) + 1), 0.0]
+        series[0][bisect_left(self.buckets, value)] += 1
+        series[1] += value
+
+    def render(self, series=None):
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} histogram"]
+        for tool, (counts, total) in sorted((self.series if series is None else series).items()):
+            cumulative = 0
+            for bound, count in zip(self.buckets, counts):
+                cumulative += count
+                lines.append(f'{self.name}_bucket{{tool="{tool}",le="{bound}"}} {cumulative}')
+            cumulative += counts[-1]
+            lines.append(f'{self.name}_bucket{{tool="{tool}",le="+Inf"}} {cumulative}')
+            lines.append(f'{self.name}_sum{{tool="{tool}"}} {total}')
+            lines.append(f'{self.name}_count{{tool="{tool}"}} {cumulative}')
+        return lines
+
+class ToolMetrics:
+    """Per-tool latency, rows, response size, SQL statement and error metrics.
+
+    Updates are a handful of list increments under a lock, so it is cheap
+    enough to leave on. Response size uses encoding.sample_json_bytes,
+    which sizes at most the first rows of a long result and extrapolates,
+    and is computed before taking the lock.
+    """
+    def __init__(self, enabled=True):
+        self.enabled = enabled
+        self.lock = threading.Lock()
+        self.latency = Histogram("legal_mcp_tool_duration_seconds", "Tool call latency in seconds.", LATENCY_BUCKETS)
+        self.rows = Histogram("legal_mcp_tool_rows_returned", "Rows returned per tool call.", ROW_BUCKETS)
+        self.bytes = Histogram("legal_mcp_tool_response_bytes", "Estimated JSON size of tool results.", BYTE_BUCKETS)
+        self.statements = Histogram("legal_mcp_tool_sql_statements", "SQL statements executed per tool call.", STATEMENT_BUCKETS)
+        self.histograms = (self.latency, self.rows, self.bytes, self.statements)
+        self.errors = {}
+        self.directory = None
+        self.version = 0
+
+    def record(self, tool, seconds, statements, result=None, error=None):
+        if error is None:
+            rows, size = count_rows(result), sample_json_bytes(result)
+        with self.lock:
+            self.version += 1
+            self.latency.observe(tool, seconds)
+            self.statements.observe(tool, statements)
+            if error is not None:
+                key = (tool, type(error).__name__)
+                self.errors[key] = self.errors.get(key, 0) + 1
+            else:
+                self.rows.observe(tool, rows)
+                self.bytes.observe(tool, size)
+
+    def instrument(self, fn):
+        """Wrap an async tool so every call is measured under its name."""
+        @functools.wraps(fn)
+        async def wrapper(*args, **kwargs):
+            tool_token = current_tool.set(fn.__name__)
+            if not self.enabled:
+                try:
+                    return await fn(*args, **kwargs)
+                finally:
+                    current_tool.reset(tool_token)
+            statements = [0]
+            token = current_call_statements.set(statements)
+            start = time.perf_counter()
+            try:
+                result = await fn(*args, **kwargs)
+            except Exception as e:
+                self.record(fn.__name__, time.perf_counter() - start, statements[0], error=e)
+                raise
+            finally:
+                current_call_statements.reset(token)
+                current_tool.reset(tool_token)
+            self.record(fn.__name__, time.perf_counter() - start, statements[0], result=result)
+            return result
+        return wrapper
+
+    def snapshot(self):
+        """This process's metrics as plain JSON-ready data."""
+        with self.lock:
+            return {
+                "histograms": {
+                    histogram.name: {tool: [list(counts), total] for tool, (counts, total) in histogram.series.items()}
+                    for histogram in self.histograms
+                },
+                "errors": [[tool, error, count] for (tool, error), count in self.errors.items()],
+            }
+
+    def share(self, directory, interval=METRICS_FLUSH_SECONDS):
+        """Publish this process's metrics to a directory shared by all workers.
+
+        Each worker rewrites <pid>.json there whenever its metrics changed,
+        at most every `interval` seconds, and render() on any worker merges
+        every file. A scrape of the shared port therefore sees server-wide
+        totals whichever worker answers it. Files of exited workers are kept
+        so counters never go backwards; clear_shared() empties the directory
+        when the server starts.
+        """
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        path = os.path.join(directory, f"{os.getpid()}.json")
+
+        def publish():
+            written = None
+            while True:
+                if self.version != written:
+                    written = self.version
+                    with open(path + ".tmp", "w") as f:
+                        json.dump(self.snapshot(), f)
+                    os.replace(path + ".tmp", path)
+                time.sleep(interval)
+
+        threading.Thread(target=publish, name="metrics-share", daemon=True).start()
+
+    def shared_snapshots(self):
+        """Live metrics of this process plus the last published by the others."""
+        snapshots = [self.snapshot()]
+        own = f"{os.getpid()}.json"
+        for name in sorted(os.listdir(self.directory)):
+            if name.endswith(".json") and name != own:
+                try:
+                    with open(os.path.join(self.directory, name)) as f:
+                        snapshots.append(json.load(f))
+                except (OSError, ValueError):
+                    continue
+        return snapshots
+
+    def render(self):
+        """Render all metrics in the Prometheus text exposition format.
+
+        With a shared directory the counts are summed over every worker.
+        """
+        snapshots = [self.snapshot()] if self.directory is None else self.shared_snapshots()
+        lines = []
+        for histogram in self.histograms:
+            series = {}
+            for snapshot in snapshots:
+                for tool, (counts, total) in snapshot["histograms"].get(histogram.name, {}).items():
+                    merged = series.setdefault(tool, [[0] * len(counts), 0.0])
+                    merged[0] = [a + b for a, b in zip(merged[0], counts)]
+                    merged[1] += total
+            lines.extend(histogram.render(series))
+        errors = {}
+        for snapshot in snapshots:
+            for tool, error, count in snapshot["errors"]:
+                errors[(tool, error)] = errors.get((tool, error), 0) + count
+        lines.append("# HELP legal_mcp_tool_errors_total Tool calls that raised, by exception type.")
+        lines.append("# TYPE legal_mcp_tool_errors_total counter")
+        for (tool, error), count in sorted(errors.items()):
+            lines.append(f'legal_mcp_tool_errors_total{{tool="{tool}",error="{error}"}} {count}')
+        return "\n".join(lines) + "\n"
+
+def count_rows(result) -> int:
+    """Number of rows in a tool result, whichever response shape it has."""
+    if isinstance(result, list):
+        return len(result)
+    if isinstance(result, dict):
+        for key in ("rows", "cases", "clients", "lawyers", "found", "created"):
+            if key in result:
+                value = result[key]
+                return count_rows(value) if key != "found" else len(value)
+        return 1
+    return 0 if result is None else 1
+
+def clear_shared(directory):
+    """Remove the metrics files a previous server run left in a directory."""
+    if os.path.isdir(directory):
+        for name in os.listdir(directory):
+            if name.endswith((".json", ".json.tmp")):
+                os.remove(os.path.join(directory, name))
+
+def install_statement_counter(sync_engine):
+    """Count statements run on an engine against the current tool call."""
+    @event.listens_for(sync_engine, "before_cursor_execute")
+    def count_statement(conn, cursor, statement, parameters, context, executemany):
+        statements = current_call_statements.get()
+        if statements is not None:
+            statements[0] += 1
+
+tool_metrics = ToolMetrics(enabled=os.getenv("LEGAL_METRICS_ENABLED", "1") != "0")
@@ -0,0 +1,53 @@
+from sqlalchemy import text
+from database import engine
+import models
+from search_index import create_search_index
+from name_index import create_name_indexes
+
+# Each migration runs once, in order, in its own write transaction. The
+# applied version is stored in SQLite's PRAGMA user_version.
+
+def add_case_indexes(conn):
+    """Index the case columns the tools filter and sort on."""
+    for column in ("client_id", "lawyer_id", "status", "date_created"):
+        conn.execute(text(f"CREATE INDEX IF NOT EXISTS ix_cases_{column} ON cases ({column})"))
+
+MIGRATIONS = [
+    (1, "Secondary indexes on cases", add_case_indexes),
+    (2, "FTS5 search index on cases", create_search_index),
+    (3, "FTS5 trigram name indexes on clients and lawyers", create_name_indexes),
+]
+
+def current_version(conn) -> int:
+    return conn.execute(text("PRAGMA user_version")).scalar()
+
+def migrate(bind=engine) -> int:
+    """Bring the database schema up to date.
+
+    Creates any missing base tables, then applies pending migrations. Each
+    migration takes the write lock with BEGIN IMMEDIATE and re-reads the
+    version under it, so main.py and mcp_server.py can start side by side.
+    Index builds hold only the write lock, so readers keep working.
+
+    Returns:
+        int: The schema version after migrating.
+    """
+    models.Base.metadata.create_all(bind=bind)
+    with bind.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        for version, description, apply in MIGRATIONS:
+            if current_version(conn) >= version:
+                continue
+            conn.exec_driver_sql("BEGIN IMMEDIATE")
+            try:
+                if current_version(conn) < version:
+                    print(f"🛠️ Migrating schema to v{version}: {description}")
+                    apply(conn)
+                    conn.exec_driver_sql(f"PRAGMA user_version = {version}")
+                conn.exec_driver_sql("COMMIT")
+            except Exception:
+                conn.exec_driver_sql("ROLLBACK")
+                raise
+        return current_version(conn)
+
+if __name__ == "__main__":
+    print("Schema version:", migrate())
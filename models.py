@@ -20,10 +20,10 @@ class Case(Base):
     id = Column(Integer, primary_key=True, index=True)
     title = Column(String)
     description = Column(Text)
-    status = Column(String, default="Open")
-    client_id = Column(Integer, ForeignKey("clients.id"))
-    lawyer_id = Column(Integer, ForeignKey("lawyers.id"))
-    date_created = Column(DateTime, default=datetime.utcnow)
+    status = Column(String, default="Open", index=True)
+    client_id = Column(Integer, ForeignKey("clients.id"), index=True)
+    lawyer_id = Column(Integer, ForeignKey("lawyers.id"), index=True)
+    date_created = Column(DateTime, default=datetime.utcnow, index=True)
     case_details = Column(Text)  # 🆕 New Column
 
     client = relationship("Client")
@@ -0,0 +1,178 @@
+from sqlalchemy import column, select, table, text, union_all
+from database import engine
+
+# Trigram FTS5 index over each name column, kept current by triggers. The
+# fts5vocab table next to it exposes how many names contain each trigram.
+NAME_INDEXES = {
+    "client": ("clients", "clients_name_fts", "clients_name_vocab"),
+    "lawyer": ("lawyers", "lawyers_name_fts", "lawyers_name_vocab"),
+}
+
+# Names fetched from the index before re-ranking by similarity
+NAME_CANDIDATES = 200
+# Most postings the typo-tolerant pass may rank; its rarest trigrams are
+# used until this many names would be scored.
+MAX_FUZZY_POSTINGS = 20000
+# Words up to this long share no trigram with themselves after one edit
+# ("iyr"/"iyer"), so the typo pass also matches them on their first two letters
+SHORT_WORD = 4
+
+def name_index_ddl(source, fts, vocab):
+    return [
+        f"""
+        CREATE VIRTUAL TABLE IF NOT EXISTS {fts} USING fts5(
+            name, content='{source}', content_rowid='id', tokenize='trigram'
+        )
+        """,
+        f"CREATE VIRTUAL TABLE IF NOT EXISTS {vocab} USING fts5vocab({fts}, 'row')",
+        f"""
+        CREATE TRIGGER IF NOT EXISTS {fts}_ai AFTER INSERT ON {source} BEGIN
+            INSERT INTO {fts}(rowid, name) VALUES (new.id, new.name);
+        END
+        """,
+        f"""
+        CREATE TRIGGER IF NOT EXISTS {fts}_ad AFTER DELETE ON {source} BEGIN
+            INSERT INTO {fts}({fts}, rowid, name) VALUES ('delete', old.id, old.name);
+        END
+        """,
+        f"""
+        CREATE TRIGGER IF NOT EXISTS {fts}_au AFTER UPDATE OF name ON {source} BEGIN
+            INSERT INTO {fts}({fts}, rowid, name) VALUES ('delete', old.id, old.name);
+            INSERT INTO {fts}(rowid, name) VALUES (new.id, new.name);
+        END
+        """,
+    ]
+
+def create_name_indexes(conn):
+    """Create the trigram name indexes on clients and lawyers, then fill them."""
+    for source, fts, vocab in NAME_INDEXES.values():
+        for statement in name_index_ddl(source, fts, vocab):
+            conn.execute(text(statement))
+    rebuild_name_indexes(conn)
+
+def rebuild_name_indexes(conn):
+    for _, fts, _ in NAME_INDEXES.values():
+        conn.execute(text(f"INSERT INTO {fts}({fts}) VALUES ('rebuild')"))
+
+def normalize(name: str) -> str:
+    return " ".join(name.lower().split())
+
+def index_trigrams(name: str):
+    """The trigrams the FTS5 tokenizer indexes for a name, in order."""
+    name = normalize(name)
+    return list(dict.fromkeys(name[i:i + 3] for i in range(len(name) - 2)))
+
+def quote(term: str) -> str:
+    return '"' + term.replace('"', '""') + '"'
+
+def query_words(name: str):
+    return [word for word in normalize(name).split() if len(word) >= 3]
+
+def substring_query(name: str) -> str:
+    """MATCH expression for names containing every word of at least 3 letters."""
+    return " ".join(quote(word) for word in query_words(name))
+
+def edit_variants(word: str):
+    """The word with one letter dropped or two neighbouring letters swapped."""
+    variants = {word[:i] + word[i + 1:] for i in range(len(word))}
+    variants.update(word[:i] + word[i + 1] + word[i] + word[i + 2:] for i in range(len(word) - 1))
+    return variants
+
+def typo_query(name: str, prefix_terms) -> str:
+    """MATCH expression for names with every query word at most one edit away.
+
+    Each word of at least 3 letters becomes an OR of itself and its
+    edit_variants. Short words also match any word starting with their first
+    two letters: " io" inside a name, or ^"iox" for each indexed trigram
+    "iox" (from prefix_terms) at its start.
+    """
+    groups = []
+    for word in query_words(name):
+        terms = [quote(variant) for variant in sorted({word, *edit_variants(word)}) if len(variant) >= 3]
+        if len(word) <= SHORT_WORD:
+            prefix = word[:2]
+            terms.append(quote(" " + prefix))
+            terms += ["^" + quote(term) for term in prefix_terms if term.startswith(prefix)]
+        groups.append("(" + " OR ".join(terms) + ")")
+    return " AND ".join(groups)
+
+def short_word_prefixes(name: str):
+    return sorted({word[:2] for word in query_words(name) if len(word) <= SHORT_WORD})
+
+def rare_trigram_query(doc_counts) -> str:
+    """MATCH expression ORing the rarest trigrams within the postings budget.
+
+    Common trigrams ("an ", "mar") match a large share of all names and
+    would make ranking scan most of the index, so trigrams are taken rarest
+    first until MAX_FUZZY_POSTINGS. The rarest one is always kept.
+    """
+    chosen, postings = [], 0
+    for term, docs in sorted(doc_counts.items(), key=lambda item: item[1]):
+        if chosen and postings + docs > MAX_FUZZY_POSTINGS:
+            break
+        chosen.append(term)
+        postings += docs
+    return " OR ".join(quote(term) for term in chosen)
+
+def vocab_select(vocab, terms):
+    """One statement looking up the document count of each trigram.
+
+    fts5vocab only seeks for term = ?, so the lookups are UNIONed rather
+    than passed as one IN list, which would scan the vocabulary.
+    """
+    vocab_table = table(vocab, column("term"), column("doc"))
+    return union_all(*(
+        select(vocab_table.c.term, vocab_table.c.doc).where(vocab_table.c.term == term) for term in terms
+    ))
+
+def prefix_select(vocab, prefixes):
+    """One statement listing the indexed trigrams that start with each prefix."""
+    vocab_table = table(vocab, column("term"))
+    return union_all(*(
+        select(vocab_table.c.term).where(vocab_table.c.term >= prefix, vocab_table.c.term < prefix + "\U0010ffff")
+        for prefix in prefixes
+    ))
+
+def word_trigrams(name: str):
+    """pg_trgm-style trigrams: each word padded, so word starts weigh more."""
+    trigrams = set()
+    for word in normalize(name).split():
+        padded = f"  {word} "
+        trigrams.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return trigrams
+
+def similarity(a: str, b: str) -> float:
+    """Share of trigrams two names have in common (0 to 1)."""
+    ta, tb = word_trigrams(a), word_trigrams(b)
+    if not ta or not tb:
+        return 0.0
+    return len(ta & tb) / len(ta | tb)
+
+def edits(a: str, b: str) -> int:
+    """0 for equal words, 1 if one edit apart (a letter added, dropped or
+    changed, or two neighbouring letters swapped), otherwise 2."""
+    if a == b:
+        return 0
+    if abs(len(a) - len(b)) > 1:
+        return 2
+    i = next((i for i, (x, y) in enumerate(zip(a, b)) if x != y), min(len(a), len(b)))
+    if len(a) > len(b):
+        one = a[i + 1:] == b[i:]
+    elif len(a) < len(b):
+        one = a[i:] == b[i + 1:]
+    else:
+        one = a[i + 1:] == b[i + 1:] or (a[i + 1:i + 2] == b[i] and a[i] == b[i + 1:i + 2] and a[i + 2:] == b[i + 2:])
+    return 1 if one else 2
+
+def word_edits(query: str, name: str):
+    """edits() from each query word to the closest word of the name."""
+    words = normalize(name).split() or [""]
+    return [min(edits(word, other) for other in words) for word in normalize(query).split()]
+
+if __name__ == "__main__":
+    # One-shot backfill for an existing legal.db
+    from migrations import migrate
+    migrate()
+    with engine.begin() as conn:
+        rebuild_name_indexes(conn)
+    print("✅ Client and lawyer name indexes rebuilt")
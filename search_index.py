@@ -0,0 +1,64 @@
+from sqlalchemy import text
+from database import engine
+
+FTS_TABLE = "cases_fts"
+
+FTS_DDL = [
+    f"""
+    CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5(
+        title, description, case_details,
+        content='cases', content_rowid='id'
+    )
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS cases_fts_ai AFTER INSERT ON cases BEGIN
+        INSERT INTO {FTS_TABLE}(rowid, title, description, case_details)
+        VALUES (new.id, new.title, new.description, new.case_details);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS cases_fts_ad AFTER DELETE ON cases BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, title, description, case_details)
+        VALUES ('delete', old.id, old.title, old.description, old.case_details);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS cases_fts_au AFTER UPDATE ON cases BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, title, description, case_details)
+        VALUES ('delete', old.id, old.title, old.description, old.case_details);
+        INSERT INTO {FTS_TABLE}(rowid, title, description, case_details)
+        VALUES (new.id, new.title, new.description, new.case_details);
+    END
+    """,
+]
+
+def create_search_index(conn):
+    """Create the FTS5 index over cases and its sync triggers, then fill it.
+
+    The index uses the cases table as external content, so only the token
+    index is stored. Safe to run on a database that already has it.
+    """
+    for statement in FTS_DDL:
+        conn.execute(text(statement))
+    rebuild_search_index(conn)
+
+def rebuild_search_index(conn):
+    """Rebuild the whole FTS5 index from the cases table."""
+    conn.execute(text(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')"))
+
+def to_match_query(query: str) -> str:
+    """Turn free text into an FTS5 MATCH expression.
+
+    Each word is quoted so FTS5 operators in user input are taken literally,
+    and gets a prefix wildcard so partial words still match.
+    """
+    terms = query.split()
+    return " ".join('"' + term.replace('"', '""') + '"*' for term in terms)
+
+if __name__ == "__main__":
+    # One-shot backfill for an existing legal.db
+    from migrations import migrate
+    migrate()
+    with engine.begin() as conn:
+        rebuild_search_index(conn)
+    print("✅ Case search index rebuilt")
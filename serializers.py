@@ -0,0 +1,90 @@
+from typing import Dict, List, Optional
+from sqlalchemy import String, select, type_coerce
+import models
+
+# Every tool builds its rows with these Core SELECTs and rows_to_dicts(), so
+# results come straight from the cursor as plain dicts. No ORM instances are
+# created, so there's no identity map, instrumentation or lazy loading.
+
+# Fields that can be requested from the case tools, and where they come from
+CASE_FIELDS = {
+    "id": models.Case.id,
+    "title": models.Case.title,
+    "description": models.Case.description,
+    "status": models.Case.status,
+    "case_details": models.Case.case_details,
+    "client_id": models.Case.client_id,
+    "lawyer_id": models.Case.lawyer_id,
+    # The stored UTC timestamp text ("2025-06-01 09:30:00.000000"), read
+    # as-is so it needs no datetime conversion and is JSON-ready
+    "created_at": type_coerce(models.Case.date_created, String),
+    "client_name": models.Client.name,
+    "client_contact": models.Client.contact,
+    "lawyer_name": models.Lawyer.name,
+    "lawyer_specialization": models.Lawyer.specialization,
+}
+
+# The case payload returned when no fields are requested
+DEFAULT_CASE_FIELDS = [
+    "id", "title", "description", "client_id", "lawyer_id", "created_at",
+    "client_name", "client_contact", "lawyer_name", "lawyer_specialization",
+]
+
+CLIENT_FIELDS = {
+    "id": models.Client.id,
+    "name": models.Client.name,
+    "contact": models.Client.contact,
+}
+
+LAWYER_FIELDS = {
+    "id": models.Lawyer.id,
+    "name": models.Lawyer.name,
+    "specialization": models.Lawyer.specialization,
+}
+
+def case_select(fields: Optional[List[str]] = None):
+    """SELECT for case rows with exactly the requested fields.
+
+    Only the listed columns are selected, so large Text columns that were
+    not asked for are never read, and clients/lawyers are outer-joined only
+    when one of their fields is requested. The case id is always included.
+
+    Args:
+        fields: Names from CASE_FIELDS; defaults to DEFAULT_CASE_FIELDS.
+
+    Raises:
+        ValueError: If a field name is not in CASE_FIELDS.
+    """
+    if fields is None:
+        fields = DEFAULT_CASE_FIELDS
+    unknown = [name for name in fields if name not in CASE_FIELDS]
+    if unknown:
+        raise ValueError(
+            f"Unknown case fields: {', '.join(unknown)}. "
+            f"Valid fields: {', '.join(CASE_FIELDS)}"
+        )
+    names = ["id"] + [name for name in dict.fromkeys(fields) if name != "id"]
+    statement = select(*(CASE_FIELDS[name].label(name) for name in names)).select_from(models.Case)
+    if {"client_name", "client_contact"} & set(names):
+        statement = statement.outerjoin(models.Client, models.Client.id == models.Case.client_id)
+    if {"lawyer_name", "lawyer_specialization"} & set(names):
+        statement = statement.outerjoin(models.Lawyer, models.Lawyer.id == models.Case.lawyer_id)
+    return statement
+
+def client_select():
+    """SELECT for client rows."""
+    return select(*(column.label(name) for name, column in CLIENT_FIELDS.items()))
+
+def lawyer_select():
+    """SELECT for lawyer rows."""
+    return select(*(column.label(name) for name, column in LAWYER_FIELDS.items()))
+
+def rows_to_dicts(result) -> List[Dict]:
+    """Map every row of a Core result to a dict keyed by column label."""
+    keys = list(result.keys())
+    return [dict(zip(keys, row)) for row in result]
+
+def first_dict(result) -> Optional[Dict]:
+    """Map the first row of a Core result to a dict, or None if empty."""
+    row = result.first()
+    return None if row is None else dict(zip(result.keys(), row))
@@ -0,0 +1,265 @@
+import json
+import math
+import os
+import re
+import threading
+import time
+import zlib
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+from sqlalchemy import func, select
+from database import database_file, read_engine
+import models
+
+try:
+    import fcntl
+except ImportError:  # Windows: no cross-process lock, one server process only
+    fcntl = None
+
+# The database the index is built from, recorded in its metadata
+DATABASE_FILE = database_file()
+# Path prefix of the index files (.vectors, .ids, .df.npy, .json, .lock),
+# next to the database by default
+SIMILARITY_INDEX = os.getenv("LEGAL_SIMILARITY_INDEX") or (
+    f"{DATABASE_FILE}.similarity" if DATABASE_FILE else "legal_similarity"
+)
+# Hash buckets per vector; 512 float32s = 2 KB per case on disk
+VECTOR_DIM = int(os.getenv("LEGAL_SIMILARITY_DIM", 512))
+# Cases read and embedded per round trip while catching up
+SYNC_BATCH = 10000
+# Rows scored per matrix-vector product, to bound the scratch memory
+SEARCH_CHUNK = 65536
+# Seconds a write waits before syncing, so a burst of inserts shares one sync
+SYNC_DELAY_SECONDS = float(os.getenv("LEGAL_SIMILARITY_SYNC_DELAY", 1.0))
+
+TOKEN = re.compile(r"[a-z0-9]+")
+STOPWORDS = frozenset(
+    "a an and are as at be by for from has in is it its of on or that the this to was were with".split()
+)
+
+def case_text(title, description, case_details) -> str:
+    """Text a case is embedded from; the title counts twice."""
+    return " ".join(part for part in (title, title, description, case_details) if part)
+
+def terms(text):
+    """Lower-cased words minus stopwords, plus adjacent word pairs."""
+    words = [word for word in TOKEN.findall(text.lower()) if word not in STOPWORDS]
+    return words + [f"{a} {b}" for a, b in zip(words, words[1:])]
+
+def hashed_terms(text, dim):
+    """(bucket, signed log term frequency) pairs of a text's hashed terms."""
+    features = []
+    for term, count in Counter(terms(text)).items():
+        h = zlib.crc32(term.encode())
+        features.append((h % dim, (1.0 + math.log(count)) * (1.0 if h & 0x80000000 else -1.0)))
+    return features
+
+class SimilarityIndex:
+    """Hashed TF-IDF vectors of every case in memory-mapped files.
+
+    Each case becomes a unit vector of VECTOR_DIM hash buckets, weighted by
+    the IDF at the time it was indexed, so cosine similarity is a plain dot
+    product and top-k is one matrix-vector product over the mapped rows.
+    The index follows the cases table by id: sync() embeds any cases past
+    the last one indexed, so rows written by add_case, the bulk tools or
+    main.py are all picked up. The metadata records which database the
+    index was built from; an index from another database, or one that has
+    seen case ids the database doesn't have, is rebuilt on the next sync.
+
+    A first build embeds every case (about 6.5 s per 100k cases). The
+    server starts one in the background; `python similarity.py` builds
+    ahead of time. Rebuild now and then to refresh the IDF.
+    """
+    def __init__(self, path=SIMILARITY_INDEX, dim=VECTOR_DIM, bind=read_engine, database=DATABASE_FILE):
+        self.path = path
+        self.vector_dim = self.dim = dim
+        self.bind = bind
+        self.database = database
+        self.lock = threading.Lock()
+        self.background = ThreadPoolExecutor(max_workers=1, thread_name_prefix="similarity-sync")
+        self.pending_lock = threading.Lock()
+        self.pending = False
+        self.meta = None
+        self.meta_mtime = None
+        self.vectors = None
+        self.ids = None
+        self.df = None
+
+    def file(self, suffix):
+        return f"{self.path}.{suffix}"
+
+    def load(self):
+        """(Re)open the index files if they changed since last loaded."""
+        try:
+            mtime = os.stat(self.file("json")).st_mtime_ns
+        except FileNotFoundError:
+            if self.meta is None:
+                self.meta = {"dim": self.dim, "count": 0, "capacity": 0, "documents": 0, "last_case_id": 0,
+                             "database": self.database}
+                self.df = np.zeros(self.dim, dtype=np.float64)
+            return
+        if mtime == self.meta_mtime:
+            return
+        with open(self.file("json")) as f:
+            self.meta = json.load(f)
+        self.meta_mtime = mtime
+        self.dim = self.meta["dim"]
+        self.df = np.load(self.file("df.npy"))
+        self.map_files()
+
+    def map_files(self):
+        self.vectors = self.ids = None
+        capacity = self.meta["capacity"]
+        if capacity:
+            self.vectors = np.memmap(self.file("vectors"), dtype=np.float32, mode="r+", shape=(capacity, self.dim))
+            self.ids = np.memmap(self.file("ids"), dtype=np.int64, mode="r+", shape=(capacity,))
+
+    def ensure_capacity(self, rows):
+        capacity = self.meta["capacity"]
+        if rows <= capacity:
+            return
+        new_capacity = max(rows, capacity * 2, 1024)
+        if self.vectors is not None:
+            self.vectors.flush()
+            self.ids.flush()
+        self.vectors = self.ids = None
+        for suffix, row_bytes in (("vectors", self.dim * 4), ("ids", 8)):
+            with open(self.file(suffix), "ab") as f:
+                f.truncate(new_capacity * row_bytes)
+        self.meta["capacity"] = new_capacity
+        self.map_files()
+
+    def save(self):
+        self.vectors.flush()
+        self.ids.flush()
+        np.save(self.file("df.npy"), self.df)
+        with open(self.file("json.tmp"), "w") as f:
+            json.dump(self.meta, f)
+        os.replace(self.file("json.tmp"), self.file("json"))
+        self.meta_mtime = os.stat(self.file("json")).st_mtime_ns
+
+    def embed(self, texts, update_df=False):
+        """Unit TF-IDF vectors for texts, optionally counting them into DF."""
+        features = [hashed_terms(text, self.dim) for text in texts]
+        if update_df:
+            for doc in features:
+                self.df[list({bucket for bucket, _ in doc})] += 1
+            self.meta["documents"] += len(texts)
+        idf = np.log((1.0 + self.meta["documents"]) / (1.0 + self.df)) + 1.0
+        matrix = np.zeros((len(texts), self.dim), dtype=np.float32)
+        for row, doc in enumerate(features):
+            for bucket, weight in doc:
+                matrix[row, bucket] += weight
+        matrix *= idf.astype(np.float32)
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        return matrix / np.where(norms == 0, 1, norms)
+
+    def sync(self) -> int:
+        """Embed every case added since the last sync. Returns how many."""
+        with self.lock, FileLock(self.file("lock")):
+            self.load()
+            added = 0
+            with self.bind.connect() as conn:
+                max_case_id = conn.execute(select(func.max(models.Case.id))).scalar() or 0
+                if (self.meta.get("database") != self.database
+                        or self.meta["last_case_id"] > max_case_id):
+                    self.reset()
+                    self.load()
+                while True:
+                    rows = conn.execute(
+                        select(models.Case.id, models.Case.title, models.Case.description, models.Case.case_details)
+                        .where(models.Case.id > self.meta["last_case_id"])
+                        .order_by(models.Case.id)
+                        .limit(SYNC_BATCH)
+                    ).all()
+                    if not rows:
+                        break
+                    count = self.meta["count"]
+                    self.ensure_capacity(count + len(rows))
+                    self.vectors[count:count + len(rows)] = self.embed(
+                        [case_text(*row[1:]) for row in rows], update_df=True
+                    )
+                    self.ids[count:count + len(rows)] = [row[0] for row in rows]
+                    self.meta["count"] = count + len(rows)
+                    self.meta["last_case_id"] = rows[-1][0]
+                    added += len(rows)
+            if added:
+                self.save()
+            return added
+
+    def sync_in_background(self, delay=SYNC_DELAY_SECONDS):
+        """Sync after `delay` seconds without waiting for it.
+
+        Calls made while a sync is still waiting to start are merged into
+        it, so a burst of inserts costs one index save, not one each.
+        """
+        with self.pending_lock:
+            if self.pending:
+                return
+            self.pending = True
+        self.background.submit(self.delayed_sync, delay)
+
+    def delayed_sync(self, delay):
+        time.sleep(delay)
+        with self.pending_lock:
+            self.pending = False
+        self.sync()
+
+    def find(self, text, k, exclude_id=None):
+        """Top-k (case_id, cosine similarity) pairs for a text, best first."""
+        self.sync()
+        with self.lock:
+            count = self.meta["count"]
+            if count == 0:
+                return []
+            query = self.embed([text])[0]
+            scores = np.empty(count, dtype=np.float32)
+            for start in range(0, count, SEARCH_CHUNK):
+                end = min(start + SEARCH_CHUNK, count)
+                scores[start:end] = self.vectors[start:end] @ query
+            ids = self.ids[:count]
+            if exclude_id is not None:
+                scores[ids == exclude_id] = -1.0
+            k = min(k, count)
+            top = np.argpartition(-scores, k - 1)[:k]
+            top = top[np.argsort(-scores[top])]
+            return [(int(ids[i]), float(scores[i])) for i in top if scores[i] > 0]
+
+    def reset(self):
+        """Drop the index files; the next sync embeds every case again."""
+        self.vectors = self.ids = self.meta = self.meta_mtime = None
+        for suffix in ("json", "vectors", "ids", "df.npy"):
+            if os.path.exists(self.file(suffix)):
+                os.remove(self.file(suffix))
+        self.dim = self.vector_dim
+
+    def rebuild(self) -> int:
+        """Drop the index files and embed every case again."""
+        with self.lock, FileLock(self.file("lock")):
+            self.reset()
+        return self.sync()
+
+class FileLock:
+    """Exclusive lock on a file, so server processes append one at a time."""
+    def __init__(self, path):
+        self.path = path
+        self.handle = None
+
+    def __enter__(self):
+        if fcntl is not None:
+            self.handle = open(self.path, "a")
+            fcntl.flock(self.handle, fcntl.LOCK_EX)
+        return self
+
+    def __exit__(self, *exc):
+        if self.handle is not None:
+            fcntl.flock(self.handle, fcntl.LOCK_UN)
+            self.handle.close()
+            self.handle = None
+
+similarity_index = SimilarityIndex()
+
+if __name__ == "__main__":
+    # Full rebuild, e.g. after a large import or to refresh the IDF weights
+    print(f"✅ Similarity index rebuilt with {similarity_index.rebuild():,} cases")
@@ -0,0 +1,11 @@
+# Point the server at a throwaway database before any test imports it
+import os
+import sys
+import tempfile
+
+TMP = tempfile.mkdtemp()
+os.environ["LEGAL_DB_URL"] = f"sqlite:///{TMP}/legal.db"
+os.environ["LEGAL_SLOW_QUERY_MS"] = "-1"
+os.environ["LEGAL_CACHE_ENABLED"] = "0"
+os.environ["LEGAL_SIMILARITY_INDEX"] = os.path.join(TMP, "similarity")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
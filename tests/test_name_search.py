@@ -0,0 +1,35 @@
+# Name lookups must survive a one-letter typo, including in words too short
+# to share a trigram with the name they were meant to match.
+import asyncio
+
+import pytest
+from sqlalchemy import insert
+import mcp_server
+import models
+
+# Jane Doe comes first so an id tie-break would rank her above John Doe
+CLIENTS = ["Jane Doe", "John Doe", "Alice Johnson", "Johnny Smith", "Bob Smith"]
+LAWYERS = ["Meera Iyer", "Ira Mehta", "Priya Sharma"]
+
+@pytest.fixture(scope="module", autouse=True)
+def names():
+    with mcp_server.engine.begin() as conn:
+        conn.execute(insert(models.Client), [{"name": name, "contact": "contact"} for name in CLIENTS])
+        conn.execute(insert(models.Lawyer), [{"name": name, "specialization": "Criminal Law"} for name in LAWYERS])
+
+def names_found(find, name):
+    return [row["name"] for row in asyncio.run(find(name))]
+
+@pytest.mark.parametrize("find, name, expected", [
+    (mcp_server.find_clients_by_name, "John Doe", "John Doe"),
+    (mcp_server.find_clients_by_name, "Jhon", "John Doe"),
+    (mcp_server.find_clients_by_name, "Jhonn Smith", "Johnny Smith"),
+    (mcp_server.find_lawyers_by_name, "Iyr", "Meera Iyer"),
+    (mcp_server.find_lawyers_by_name, "Mera Iyr", "Meera Iyer"),
+])
+def test_best_match(find, name, expected):
+    assert names_found(find, name)[0] == expected
+
+def test_closer_spelling_breaks_similarity_tie():
+    found = names_found(mcp_server.find_clients_by_name, "Jhon Doe")
+    assert found.index("John Doe") < found.index("Jane Doe")
@@ -0,0 +1,66 @@
+# Every case tool must issue a fixed number of SQL statements however many
+# cases it returns, i.e. no per-row loads of a case's client or lawyer.
+# Runs against the throwaway database (see conftest.py), which grows
+# between measurements.
+import asyncio
+
+import pytest
+from sqlalchemy import event, func, insert, select
+import mcp_server
+import models
+
+TOOLS = {
+    "get_all_cases": lambda: mcp_server.get_all_cases(),
+    "search_cases": lambda: mcp_server.search_cases("theft", limit=500),
+    "get_cases_by_client": lambda: mcp_server.get_cases_by_client(1),
+    "get_cases_by_lawyer": lambda: mcp_server.get_cases_by_lawyer(1),
+    "get_case_by_id": lambda: mcp_server.get_case_by_id(1),
+}
+
+# One SELECT for the cases; the by_client/by_lawyer tools also check that
+# the client or lawyer exists.
+EXPECTED_STATEMENTS = {
+    "get_all_cases": 1,
+    "search_cases": 1,
+    "get_cases_by_client": 2,
+    "get_cases_by_lawyer": 2,
+    "get_case_by_id": 1,
+}
+
+def grow_to(n_cases):
+    """Add cases (all for client 1 and lawyer 1) until there are n_cases."""
+    with mcp_server.engine.begin() as conn:
+        if conn.execute(select(func.count(models.Client.id))).scalar() == 0:
+            conn.execute(insert(models.Client), [{"name": f"Client {i}", "contact": f"c{i}"} for i in range(1, 4)])
+            conn.execute(insert(models.Lawyer), [{"name": f"Lawyer {i}", "specialization": "Criminal Law"} for i in range(1, 4)])
+        existing = conn.execute(select(func.count(models.Case.id))).scalar()
+        if existing >= n_cases:
+            return
+        conn.execute(insert(models.Case), [
+            {"title": f"Theft case {i}", "description": "Theft at the market", "status": "Open",
+             "case_details": "details", "client_id": 1, "lawyer_id": 1}
+            for i in range(existing, n_cases)
+        ])
+
+def count_statements(call):
+    """Run a tool and return how many statements reached the database."""
+    statements = []
+    def count(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+    engines = (mcp_server.async_engine.sync_engine, mcp_server.read_engine, mcp_server.engine)
+    for sync_engine in engines:
+        event.listen(sync_engine, "before_cursor_execute", count)
+    try:
+        asyncio.run(call())
+    finally:
+        for sync_engine in engines:
+            event.remove(sync_engine, "before_cursor_execute", count)
+    return len(statements)
+
+@pytest.mark.parametrize("tool", TOOLS)
+def test_statement_count_does_not_grow_with_rows(tool):
+    counts = []
+    for n_cases in (5, 50, 500):
+        grow_to(n_cases)
+        counts.append(count_statements(TOOLS[tool]))
+    assert counts == [EXPECTED_STATEMENTS[tool]] * 3
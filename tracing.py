@@ -0,0 +1,216 @@
+import argparse
+import contextvars
+import functools
+import json
+import os
+import secrets
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+
+from sqlalchemy import event
+
+# Spans are appended here as JSON lines; tracing is off when this is empty
+TRACE_FILE = os.getenv("LEGAL_TRACE_FILE", "")
+
+current_span = contextvars.ContextVar("current_span", default=None)
+
+class Span:
+    """One timed operation in a trace, written out when it ends."""
+    __slots__ = ("trace_id", "span_id", "parent_id", "name", "attributes", "start", "start_perf")
+
+    def __init__(self, name, trace_id, parent_id=None, attributes=None):
+        self.trace_id = trace_id
+        self.span_id = secrets.token_hex(8)
+        self.parent_id = parent_id
+        self.name = name
+        self.attributes = dict(attributes or {})
+        self.start = time.time()
+        self.start_perf = time.perf_counter()
+
+    def traceparent(self) -> str:
+        """W3C traceparent header value pointing at this span."""
+        return f"00-{self.trace_id}-{self.span_id}-01"
+
+    def end(self, error=None):
+        record = {
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "name": self.name,
+            "start": self.start,
+            "duration_ms": (time.perf_counter() - self.start_perf) * 1000,
+            "attributes": self.attributes,
+        }
+        if error is not None:
+            record["error"] = f"{type(error).__name__}: {error}"
+        exporter.export(record)
+
+class JsonlExporter:
+    """Appends finished spans to a JSONL file shared by client and server."""
+    def __init__(self, path):
+        self.path = path
+        self.lock = threading.Lock()
+        self.file = None
+
+    @property
+    def enabled(self):
+        return bool(self.path)
+
+    def export(self, record):
+        line = json.dumps(record, default=str) + "\n"
+        with self.lock:
+            if self.file is None:
+                self.file = open(self.path, "a", encoding="utf-8")
+            self.file.write(line)
+            self.file.flush()
+
+exporter = JsonlExporter(TRACE_FILE)
+
+def parse_traceparent(value):
+    """Return (trace_id, parent_span_id) from a traceparent, or None."""
+    parts = (value or "").split("-")
+    if len(parts) != 4 or len(parts[1]) != 32 or len(parts[2]) != 16:
+        return None
+    return parts[1], parts[2]
+
+def start_span(name, parent=None, traceparent=None, **attributes):
+    """Start a span without making it current; call .end() to finish it.
+
+    The parent is, in order: the given span, the given traceparent from
+    another process, the current span, or none (a new trace).
+    """
+    if not exporter.enabled:
+        return None
+    if parent is None and traceparent is None:
+        parent = current_span.get()
+    if parent is not None:
+        return Span(name, parent.trace_id, parent.span_id, attributes)
+    remote = parse_traceparent(traceparent)
+    if remote is not None:
+        return Span(name, remote[0], remote[1], attributes)
+    return Span(name, secrets.token_hex(16), None, attributes)
+
+@contextmanager
+def span(name, traceparent=None, **attributes):
+    """Trace a block as a child of the current span and make it current."""
+    active = start_span(name, traceparent=traceparent, **attributes)
+    if active is None:
+        yield None
+        return
+    token = current_span.set(active)
+    try:
+        yield active
+    except BaseException as e:
+        active.end(error=e)
+        raise
+    else:
+        active.end()
+    finally:
+        current_span.reset(token)
+
+def current_traceparent():
+    """traceparent of the current span, to send along with a request."""
+    active = current_span.get()
+    return active.traceparent() if active is not None else None
+
+def request_traceparent():
+    """traceparent sent in the _meta of the MCP request being handled."""
+    from mcp.server.lowlevel.server import request_ctx
+    try:
+        meta = request_ctx.get().meta
+    except LookupError:
+        return None
+    return getattr(meta, "traceparent", None) if meta is not None else None
+
+def traced_tool(fn):
+    """Wrap an async MCP tool in a span joined to the caller's trace."""
+    @functools.wraps(fn)
+    async def wrapper(*args, **kwargs):
+        if not exporter.enabled:
+            return await fn(*args, **kwargs)
+        with span(f"tool.{fn.__name__}", traceparent=request_traceparent()):
+            return await fn(*args, **kwargs)
+    return wrapper
+
+def install_sql_tracing(sync_engine):
+    """Record a span for each SQL statement run inside a traced operation."""
+    @event.listens_for(sync_engine, "before_cursor_execute")
+    def start_statement(conn, cursor, statement, parameters, context, executemany):
+        if current_span.get() is None:
+            return
+        sql_span = start_span("sql", statement=" ".join(statement.split())[:200], executemany=executemany)
+        conn.info.setdefault("trace_spans", []).append(sql_span)
+
+    @event.listens_for(sync_engine, "after_cursor_execute")
+    def end_statement(conn, cursor, statement, parameters, context, executemany):
+        spans = conn.info.get("trace_spans")
+        if spans:
+            sql_span = spans.pop()
+            sql_span.attributes["rowcount"] = cursor.rowcount
+            sql_span.end()
+
+    @event.listens_for(sync_engine, "handle_error")
+    def fail_statement(exception_context):
+        conn = exception_context.connection
+        spans = conn.info.get("trace_spans") if conn is not None else None
+        if spans:
+            spans.pop().end(error=exception_context.original_exception)
+
+def load_traces(paths):
+    """Group the spans in JSONL files by trace ID."""
+    traces = defaultdict(list)
+    for path in paths:
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    record = json.loads(line)
+                    traces[record["trace_id"]].append(record)
+    return traces
+
+def render_waterfall(spans, width=60):
+    """Render one trace as an indented waterfall with timing bars."""
+    spans = sorted(spans, key=lambda s: s["start"])
+    by_id = {s["span_id"]: s for s in spans}
+    children = defaultdict(list)
+    roots = []
+    for s in spans:
+        (children[s["parent_id"]] if s["parent_id"] in by_id else roots).append(s)
+
+    begin = spans[0]["start"]
+    total = max(s["start"] - begin + s["duration_ms"] / 1000 for s in spans) or 1e-9
+    lines = [f"trace {spans[0]['trace_id']}  {total * 1000:.1f} ms"]
+
+    def walk(s, depth):
+        offset = int((s["start"] - begin) / total * width)
+        length = max(1, int(s["duration_ms"] / 1000 / total * width))
+        label = s["name"]
+        for key in ("tool", "statement"):
+            if key in s["attributes"]:
+                label += f" {s['attributes'][key]}"
+        label = ("  " * depth + label)[:48]
+        mark = " !" if "error" in s else ""
+        lines.append(f"{label:<48} {s['duration_ms']:>9.1f} ms |{' ' * offset}{'█' * length}{mark}")
+        for child in children[s["span_id"]]:
+            walk(child, depth + 1)
+
+    for root in roots:
+        walk(root, 0)
+    return "\n".join(lines)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Render per-turn waterfalls from trace JSONL files.")
+    parser.add_argument("files", nargs="*", default=[TRACE_FILE or "traces.jsonl"])
+    parser.add_argument("--trace", help="Only show the trace with this ID")
+    parser.add_argument("--last", type=int, default=5, help="Show the N most recent traces")
+    args = parser.parse_args()
+
+    traces = load_traces(args.files)
+    if args.trace:
+        selected = [traces[args.trace]] if args.trace in traces else []
+    else:
+        selected = sorted(traces.values(), key=lambda spans: min(s["start"] for s in spans))[-args.last:]
+    for spans in selected:
+        print(render_waterfall(spans))
+        print()
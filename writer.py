@@ -0,0 +1,113 @@
+import asyncio
+import contextvars
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from database import engine
+
+# How long the writer waits for more writes before committing a batch
+WRITE_WINDOW_MS = float(os.getenv("LEGAL_WRITE_WINDOW_MS", 1))
+# Most writes committed in one transaction
+MAX_WRITE_BATCH = int(os.getenv("LEGAL_WRITE_BATCH_MAX", 256))
+
+class WriteQueue:
+    """One writer thread that group-commits every write to the database.
+
+    A job is a function of a Connection that runs its statements and
+    returns the caller's result, e.g. the new row ID. The writer takes the
+    first waiting job, gathers whatever else arrives within the window, and
+    runs them all in one transaction, so concurrent writers share a single
+    commit instead of each paying for their own and queueing on SQLite's
+    write lock. If any job in a batch fails, the batch is rolled back and
+    its jobs are rerun one transaction each, so only that caller sees the
+    error.
+
+    Jobs run in the caller's contextvars context, so metrics, tracing and
+    the slow-query log attribute their statements to the calling tool.
+    """
+    def __init__(self, bind=engine, window_ms=WRITE_WINDOW_MS, max_batch=MAX_WRITE_BATCH):
+        self.bind = bind
+        self.window = window_ms / 1000
+        self.max_batch = max_batch
+        self.jobs = queue.SimpleQueue()
+        self.lock = threading.Lock()
+        self.thread = None
+        self.batches = 0
+        self.writes = 0
+
+    def submit(self, job) -> Future:
+        """Queue a write and return a Future for its result."""
+        if self.thread is None:
+            self.start()
+        future = Future()
+        self.jobs.put((job, contextvars.copy_context(), future))
+        return future
+
+    async def run(self, job):
+        """Queue a write and wait for its result without blocking the loop."""
+        return await asyncio.wrap_future(self.submit(job))
+
+    def start(self):
+        with self.lock:
+            if self.thread is None:
+                self.thread = threading.Thread(target=self.loop, name="legal-db-writer", daemon=True)
+                self.thread.start()
+
+    def loop(self):
+        while True:
+            batch = [self.jobs.get()]
+            # Take what queued up during the last commit. Only when writes are
+            # arriving together is it worth holding the batch open for the
+            # window; a lone write is committed straight away.
+            waiting = False
+            deadline = time.monotonic() + self.window
+            while len(batch) < self.max_batch:
+                try:
+                    if waiting:
+                        batch.append(self.jobs.get(timeout=max(0, deadline - time.monotonic())))
+                    else:
+                        batch.append(self.jobs.get_nowait())
+                        waiting = self.window > 0
+                except queue.Empty:
+                    break
+            self.commit(batch)
+
+    def commit(self, batch):
+        # Callers that were cancelled while queued are dropped
+        batch = [item for item in batch if item[2].set_running_or_notify_cancel()]
+        if not batch:
+            return
+        try:
+            with self.bind.begin() as conn:
+                results = [context.run(job, conn) for job, context, _ in batch]
+        except Exception:
+            for item in batch:
+                self.commit_alone(*item)
+        else:
+            for (_, _, future), result in zip(batch, results):
+                future.set_result(result)
+        with self.lock:
+            self.batches += 1
+            self.writes += len(batch)
+
+    def commit_alone(self, job, context, future):
+        try:
+            with self.bind.begin() as conn:
+                result = context.run(job, conn)
+        except Exception as e:
+            future.set_exception(e)
+        else:
+            future.set_result(result)
+
+    def stats(self):
+        """Writes and batches committed so far, and the mean batch size."""
+        with self.lock:
+            return {
+                "writes": self.writes,
+                "batches": self.batches,
+                "mean_batch_size": round(self.writes / self.batches, 2) if self.batches else 0.0,
+            }
+
+write_queue = WriteQueue()